@@ -0,0 +1,25 @@
+"""backfill_run_date_range
+
+Revision ID: 3d6a0f5b8e17
+Revises: 9b7e1f4c2d58
+Create Date: 2026-10-18 11:02:47.316054
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3d6a0f5b8e17'
+down_revision: Union[str, Sequence[str], None] = '9b7e1f4c2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Date range a run's archive cursor belongs to; resuming with another range is refused
+    op.add_column('backfill_runs', sa.Column('start_date', sa.Date(), nullable=True))
+    op.add_column('backfill_runs', sa.Column('end_date', sa.Date(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('backfill_runs', 'end_date')
+    op.drop_column('backfill_runs', 'start_date')
@@ -0,0 +1,36 @@
+"""unique event team stat key
+
+Revision ID: 4e8f2a61c9b7
+Revises: 7c41a9e2b3d8
+Create Date: 2026-10-17 11:03:27.184903
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '4e8f2a61c9b7'
+down_revision: Union[str, Sequence[str], None] = '7c41a9e2b3d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Keep the newest row of any duplicated (event_id, team_name); it holds the latest recalculation
+    op.execute("""
+        DELETE FROM event_team_stats a
+        USING event_team_stats b
+        WHERE a.event_id = b.event_id
+          AND a.team_name = b.team_name
+          AND a.id < b.id
+    """)
+
+    op.create_index(
+        'uq_event_team_stats_event_id_team_name',
+        'event_team_stats',
+        ['event_id', 'team_name'],
+        unique=True
+    )
+
+def downgrade() -> None:
+    op.drop_index('uq_event_team_stats_event_id_team_name', table_name='event_team_stats')
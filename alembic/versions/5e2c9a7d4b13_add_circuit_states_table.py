@@ -0,0 +1,36 @@
+"""add_circuit_states_table
+
+Revision ID: 5e2c9a7d4b13
+Revises: 3d6a0f5b8e17
+Create Date: 2026-10-18 14:27:09.581362
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5e2c9a7d4b13'
+down_revision: Union[str, Sequence[str], None] = '3d6a0f5b8e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Create circuit_states table (breaker state published by each scraping process)
+    op.create_table(
+        'circuit_states',
+        sa.Column('process', sa.String(), nullable=False),
+        sa.Column('host', sa.String(), nullable=False),
+        sa.Column('state', sa.String(), nullable=False),
+        sa.Column('consecutive_failures', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('opened_at', sa.DateTime(), nullable=True),
+        sa.Column('probe_after', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.PrimaryKeyConstraint('process', 'host')
+    )
+    op.create_index(op.f('ix_circuit_states_updated_at'), 'circuit_states', ['updated_at'], unique=False)
+
+def downgrade() -> None:
+    # Drop circuit_states table
+    op.drop_index(op.f('ix_circuit_states_updated_at'), table_name='circuit_states')
+    op.drop_table('circuit_states')
@@ -0,0 +1,43 @@
+"""unique event highlight key
+
+Revision ID: 7c41a9e2b3d8
+Revises: 32ef5da689f0
+Create Date: 2026-10-17 10:12:41.508216
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '7c41a9e2b3d8'
+down_revision: Union[str, Sequence[str], None] = '32ef5da689f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Highlights without an HLTV ID are keyed by clip ID, then URL (same fallback as the sync job)
+    op.execute("""
+        UPDATE event_highlights
+        SET highlight_id = COALESCE(video_id, url)
+        WHERE highlight_id IS NULL
+    """)
+
+    # Keep the oldest row of any duplicated (event_id, highlight_id)
+    op.execute("""
+        DELETE FROM event_highlights a
+        USING event_highlights b
+        WHERE a.event_id = b.event_id
+          AND a.highlight_id = b.highlight_id
+          AND a.id > b.id
+    """)
+
+    op.create_index(
+        'uq_event_highlights_event_id_highlight_id',
+        'event_highlights',
+        ['event_id', 'highlight_id'],
+        unique=True
+    )
+
+def downgrade() -> None:
+    op.drop_index('uq_event_highlights_event_id_highlight_id', table_name='event_highlights')
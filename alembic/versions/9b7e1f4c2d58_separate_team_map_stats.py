@@ -0,0 +1,94 @@
+"""separate_team_map_stats
+
+Revision ID: 9b7e1f4c2d58
+Revises: c4f9d2e8a613
+Create Date: 2026-10-18 09:14:22.518730
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9b7e1f4c2d58'
+down_revision: Union[str, Sequence[str], None] = 'c4f9d2e8a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Match-derived standings per (event, team), as in jobs.team_stats.recalculate_event_team_stats
+STANDINGS_SQL = """
+    SELECT
+        event_id,
+        team_name,
+        (array_agg(logo ORDER BY match_id DESC) FILTER (WHERE logo IS NOT NULL))[1] AS team_logo,
+        sum(won)::integer AS wins,
+        sum(lost)::integer AS losses,
+        coalesce(round(sum(won) * 100::numeric / nullif(sum(won) + sum(lost), 0), 2), 0) AS win_rate,
+        count(*)::integer AS maps_played
+    FROM (
+        SELECT event_id, id AS match_id, team1_name AS team_name, team1_logo AS logo,
+               (team1_score > team2_score)::int AS won, (team1_score < team2_score)::int AS lost
+        FROM matches
+        WHERE status = 'finished' AND team1_score IS NOT NULL AND team2_score IS NOT NULL
+          AND coalesce(team1_name, '') <> '' AND coalesce(team2_name, '') <> ''
+        UNION ALL
+        SELECT event_id, id, team2_name, team2_logo,
+               (team2_score > team1_score)::int, (team2_score < team1_score)::int
+        FROM matches
+        WHERE status = 'finished' AND team1_score IS NOT NULL AND team2_score IS NOT NULL
+          AND coalesce(team1_name, '') <> '' AND coalesce(team2_name, '') <> ''
+    ) perspectives
+    GROUP BY event_id, team_name
+"""
+
+def upgrade() -> None:
+    # Create event_team_map_stats table (HLTV /stats/teams numbers)
+    op.create_table(
+        'event_team_map_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('team_name', sa.String(), nullable=False),
+        sa.Column('team_logo', sa.String(), nullable=True),
+        sa.Column('wins', sa.Integer(), nullable=True),
+        sa.Column('losses', sa.Integer(), nullable=True),
+        sa.Column('win_rate', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('maps_played', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_event_team_map_stats_id'), 'event_team_map_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_event_team_map_stats_event_id'), 'event_team_map_stats', ['event_id'], unique=False)
+    op.create_index(
+        'uq_event_team_map_stats_event_id_team_name',
+        'event_team_map_stats',
+        ['event_id', 'team_name'],
+        unique=True
+    )
+
+    # event_team_stats may hold scraped numbers; rebuild it from the matches.
+    # Rows for teams without a finished match can only have come from the scrape.
+    op.execute(f"""
+        DELETE FROM event_team_stats ets
+        WHERE NOT EXISTS (
+            SELECT 1 FROM ({STANDINGS_SQL}) standings
+            WHERE standings.event_id = ets.event_id AND standings.team_name = ets.team_name
+        )
+    """)
+    op.execute(f"""
+        INSERT INTO event_team_stats (event_id, team_name, team_logo, wins, losses, win_rate, maps_played, created_at)
+        SELECT *, (now() AT TIME ZONE 'utc') FROM ({STANDINGS_SQL}) standings
+        ON CONFLICT (event_id, team_name) DO UPDATE SET
+            team_logo = excluded.team_logo,
+            wins = excluded.wins,
+            losses = excluded.losses,
+            win_rate = excluded.win_rate,
+            maps_played = excluded.maps_played
+    """)
+
+def downgrade() -> None:
+    # Drop event_team_map_stats table (standings are left as rebuilt)
+    op.drop_index('uq_event_team_map_stats_event_id_team_name', table_name='event_team_map_stats')
+    op.drop_index(op.f('ix_event_team_map_stats_event_id'), table_name='event_team_map_stats')
+    op.drop_index(op.f('ix_event_team_map_stats_id'), table_name='event_team_map_stats')
+    op.drop_table('event_team_map_stats')
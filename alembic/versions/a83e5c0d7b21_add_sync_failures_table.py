@@ -0,0 +1,51 @@
+"""add_sync_failures_table
+
+Revision ID: a83e5c0d7b21
+Revises: f7c1b8a3d5e0
+Create Date: 2026-10-17 20:03:51.227409
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a83e5c0d7b21'
+down_revision: Union[str, Sequence[str], None] = 'f7c1b8a3d5e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Create sync_failures table (dead letter for failing per-event syncs)
+    op.create_table(
+        'sync_failures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=True),
+        sa.Column('error_class', sa.String(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('first_failed_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.Column('last_failed_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.Column('next_retry_at', sa.DateTime(), nullable=False),
+        sa.Column('dead_lettered_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_failures_id'), 'sync_failures', ['id'], unique=False)
+    op.create_index(op.f('ix_sync_failures_event_id'), 'sync_failures', ['event_id'], unique=False)
+
+    # One failure row per (kind, event)
+    op.create_index(
+        'uq_sync_failures_key',
+        'sync_failures',
+        ['kind', sa.text('coalesce(event_id, 0)')],
+        unique=True
+    )
+
+def downgrade() -> None:
+    # Drop sync_failures table
+    op.drop_index('uq_sync_failures_key', table_name='sync_failures')
+    op.drop_index(op.f('ix_sync_failures_event_id'), table_name='sync_failures')
+    op.drop_index(op.f('ix_sync_failures_id'), table_name='sync_failures')
+    op.drop_table('sync_failures')
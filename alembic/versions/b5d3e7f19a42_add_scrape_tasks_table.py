@@ -0,0 +1,63 @@
+"""add_scrape_tasks_table
+
+Revision ID: b5d3e7f19a42
+Revises: 4e8f2a61c9b7
+Create Date: 2026-10-17 14:26:05.731942
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b5d3e7f19a42'
+down_revision: Union[str, Sequence[str], None] = '4e8f2a61c9b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Create scrape_tasks table (durable scrape work queue)
+    op.create_table(
+        'scrape_tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=True),
+        sa.Column('priority', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('not_before', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.Column('status', sa.String(), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('max_attempts', sa.Integer(), server_default='5', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scrape_tasks_id'), 'scrape_tasks', ['id'], unique=False)
+    op.create_index(op.f('ix_scrape_tasks_event_id'), 'scrape_tasks', ['event_id'], unique=False)
+
+    # Claim order for pending tasks
+    op.create_index(
+        'ix_scrape_tasks_claim',
+        'scrape_tasks',
+        [sa.text('priority DESC'), 'not_before'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    # At most one pending task per (kind, event)
+    op.create_index(
+        'uq_scrape_tasks_pending_key',
+        'scrape_tasks',
+        ['kind', sa.text('coalesce(event_id, 0)')],
+        unique=True,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+def downgrade() -> None:
+    # Drop scrape_tasks table
+    op.drop_index('uq_scrape_tasks_pending_key', table_name='scrape_tasks')
+    op.drop_index('ix_scrape_tasks_claim', table_name='scrape_tasks')
+    op.drop_index(op.f('ix_scrape_tasks_event_id'), table_name='scrape_tasks')
+    op.drop_index(op.f('ix_scrape_tasks_id'), table_name='scrape_tasks')
+    op.drop_table('scrape_tasks')
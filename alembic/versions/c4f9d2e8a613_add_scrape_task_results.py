@@ -0,0 +1,25 @@
+"""add_scrape_task_results
+
+Revision ID: c4f9d2e8a613
+Revises: a83e5c0d7b21
+Create Date: 2026-10-17 20:41:17.902364
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c4f9d2e8a613'
+down_revision: Union[str, Sequence[str], None] = 'a83e5c0d7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Completion time and handler summary, reported by GET /trigger/{job_id}
+    op.add_column('scrape_tasks', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.add_column('scrape_tasks', sa.Column('result', sa.JSON(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('scrape_tasks', 'result')
+    op.drop_column('scrape_tasks', 'finished_at')
@@ -0,0 +1,40 @@
+"""event stats upsert keys
+
+Revision ID: e2a9c4d81f36
+Revises: b5d3e7f19a42
+Create Date: 2026-10-17 16:48:52.390177
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e2a9c4d81f36'
+down_revision: Union[str, Sequence[str], None] = 'b5d3e7f19a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Keep the newest row of any duplicated (event_id, player_name)
+    op.execute("""
+        DELETE FROM event_player_stats a
+        USING event_player_stats b
+        WHERE a.event_id = b.event_id
+          AND a.player_name = b.player_name
+          AND a.id < b.id
+    """)
+
+    op.create_index(
+        'uq_event_player_stats_event_id_player_name',
+        'event_player_stats',
+        ['event_id', 'player_name'],
+        unique=True
+    )
+
+    # Set once the final stats pass after an event finished has run
+    op.add_column('events', sa.Column('stats_finalized_at', sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('events', 'stats_finalized_at')
+    op.drop_index('uq_event_player_stats_event_id_player_name', table_name='event_player_stats')
@@ -0,0 +1,52 @@
+"""add_backfill_checkpoints
+
+Revision ID: f7c1b8a3d5e0
+Revises: e2a9c4d81f36
+Create Date: 2026-10-17 19:12:38.604117
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f7c1b8a3d5e0'
+down_revision: Union[str, Sequence[str], None] = 'e2a9c4d81f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Archive enumeration cursor per named backfill run
+    op.create_table(
+        'backfill_runs',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('archive_offset', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('archive_done_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    # Per-event progress through the backfill stages
+    op.create_table(
+        'backfill_checkpoints',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('run_name', sa.String(), nullable=False),
+        sa.Column('results_done_at', sa.DateTime(), nullable=True),
+        sa.Column('player_stats_done_at', sa.DateTime(), nullable=True),
+        sa.Column('team_stats_done_at', sa.DateTime(), nullable=True),
+        sa.Column('highlights_done_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['run_name'], ['backfill_runs.name'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_index(op.f('ix_backfill_checkpoints_run_name'), 'backfill_checkpoints', ['run_name'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_backfill_checkpoints_run_name'), table_name='backfill_checkpoints')
+    op.drop_table('backfill_checkpoints')
+    op.drop_table('backfill_runs')
@@ -1,17 +1,60 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
-class Settings(BaseSettings):
-    database_url: str
-    api_title: str = "Multistream HLTV API"
-    api_version: str = "2.0.0"
-    cors_origins: list[str] = ["*"]
+class ScraperSettings(BaseSettings):
+    """Scraper layer settings; needs no database, so scrapers and debug scripts run offline"""
+    # Scraper HTTP layer: session pool, per-host rate limits and concurrency, circuit breakers
+    scraper_pool_size: int = 4
+    scraper_pool_idle_timeout: float = 300
+    scraper_rate_per_host: float = 1.0
+    scraper_burst_per_host: int = 3
+    scraper_image_cdn_rate: float = 20.0
+    scraper_image_cdn_burst: int = 40
+    scraper_per_host_concurrency: int = 4
+    scraper_breaker_threshold: int = 5
+    scraper_breaker_reset: float = 60
+    # HTML parse worker processes; 0 parses inline
+    scraper_parse_workers: int = 2
+    # Response cache (scrapers.cache): off, on or replay
+    scraper_cache: str = "off"
+    scraper_cache_dir: str = ".cache/hltv"
+    scraper_cache_max_mb: float = 200
 
     class Config:
         env_file = ".env"
         case_sensitive = False
         extra = "ignore"
 
+class Settings(ScraperSettings):
+    database_url: str
+    api_title: str = "Multistream HLTV API"
+    api_version: str = "2.0.0"
+    cors_origins: list[str] = ["*"]
+    # Set RUN_SCHEDULER=false on API replicas when the jobs run in `python -m jobs.worker`
+    run_scheduler: bool = True
+    # Run scrape task workers in the API process; unset follows RUN_SCHEDULER, so a
+    # single service keeps scraping and API replicas with RUN_SCHEDULER=false don't
+    run_task_workers: Optional[bool] = None
+    # PostgreSQL advisory lock key; only the process holding it runs scheduled jobs
+    scheduler_lock_key: int = 72_84_76_86
+    # Scrape task worker threads per worker process
+    scrape_task_workers: int = 2
+    # Default request budget of `python -m jobs.backfill` (0 = unlimited)
+    backfill_max_requests: int = 1000
+
+    # Overlay response cache (app.overlay_cache); a TTL of 0 disables it
+    overlay_cache_ttl: float = 10
+    overlay_cache_max_entries: int = 256
+
+    @property
+    def task_workers_in_api(self) -> bool:
+        return self.run_scheduler if self.run_task_workers is None else self.run_task_workers
+
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
+
+@lru_cache()
+def get_scraper_settings() -> ScraperSettings:
+    return ScraperSettings()
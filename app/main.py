@@ -22,17 +22,39 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting FastAPI application...")
 
-    # Start APScheduler
-    from jobs.scheduler import start_scheduler
-    start_scheduler()
+    # Start APScheduler (unless a separate jobs.worker process runs it)
+    if settings.run_scheduler:
+        from jobs.scheduler import start_scheduler
+        start_scheduler()
+    else:
+        logger.info("⏭️  Scheduler disabled in this process (RUN_SCHEDULER=false)")
+
+    # Scrape tasks queued by the scheduler or /trigger are run by task workers
+    if settings.task_workers_in_api:
+        from jobs.task_queue import start_task_workers
+        start_task_workers()
+    elif settings.run_scheduler:
+        logger.warning(
+            "⚠️  Scheduler is on but this process runs no scrape task workers (RUN_TASK_WORKERS=false): "
+            "queued scrapes only run if `python -m jobs.worker` is running"
+        )
 
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down FastAPI application...")
+    from jobs.task_queue import stop_task_workers
+    stop_task_workers()
+
     from jobs.scheduler import shutdown_scheduler
     shutdown_scheduler()
 
+    from scrapers.session import close_session_pool
+    close_session_pool()
+
+    from scrapers.parse_pool import shutdown_parse_pool
+    shutdown_parse_pool()
+
 
 app = FastAPI(
     title=settings.api_title,
@@ -50,9 +72,10 @@ app.add_middleware(
 )
 
 # Include routers
-from routers import events, proxy
+from routers import events, proxy, trigger
 app.include_router(events.router, prefix="/api")
 app.include_router(proxy.router, prefix="/api")
+app.include_router(trigger.router)
 
 @app.get("/")
 def root():
@@ -68,8 +91,23 @@ def health():
 
 @app.get("/scheduler/status")
 def scheduler_status():
-    """Check scheduler status and list configured jobs"""
+    """
+    Check scheduler status and list configured jobs
+
+    leader_active, scrape_tasks, sync_failures and hltv_circuits (published
+    by every process running scrape task workers) are read from the database
+    and hold for the whole deployment. running, jobs and everything under
+    "process" describe only the process answering this request (an API
+    replica with RUN_SCHEDULER=false runs no jobs or cadence of its own).
+    """
     from jobs.scheduler import scheduler
+    from jobs.cadence import get_sync_cadence
+    from jobs.leader import get_scheduler_leader
+    from jobs.circuit_states import circuit_summary
+    from jobs.sync_failures import failure_summary
+    from jobs.task_queue import queue_summary
+    from app.overlay_cache import get_overlay_cache
+    from scrapers.circuit_breaker import get_circuit_breakers
 
     jobs_info = []
     for job in scheduler.get_jobs():
@@ -80,28 +118,27 @@ def scheduler_status():
             "trigger": str(job.trigger)
         })
 
+    leader = get_scheduler_leader()
+
     return {
         "running": scheduler.running,
         "jobs_count": len(jobs_info),
-        "jobs": jobs_info
-    }
-
-@app.post("/trigger/sync-highlights")
-def trigger_sync_highlights(eventId: str = "8042", eventSlug: str = "starladder-budapest-major-2025"):
-    """Manually trigger event highlights sync"""
-    from jobs.sync_highlights import sync_event_highlights
-    try:
-        sync_event_highlights(eventId, eventSlug)
-        return {
-            "status": "success",
-            "message": f"Synced highlights for event {eventId}"
-        }
-    except Exception as e:
-        logger.error(f"Error syncing highlights: {e}")
-        return {
-            "status": "error",
-            "message": str(e)
+        "jobs": jobs_info,
+        # Shared state, from the database
+        "leader_active": leader.leader_active(),
+        "scrape_tasks": queue_summary(),
+        "sync_failures": failure_summary(),
+        "hltv_circuits": circuit_summary(),
+        # This process only
+        "process": {
+            "run_scheduler": settings.run_scheduler,
+            "run_task_workers": settings.task_workers_in_api,
+            "is_leader": leader.is_leader,
+            "hltv_circuits": get_circuit_breakers().snapshot(),
+            "match_sync_next_poll": get_sync_cadence().snapshot(),
+            "overlay_cache": get_overlay_cache().snapshot()
         }
+    }
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Numeric, ForeignKey, Index, JSON, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -16,6 +16,7 @@ class Event(Base):
     prize_pool = Column(String)
     location = Column(String)
     status = Column(String, default='upcoming')  # upcoming, ongoing, finished
+    stats_finalized_at = Column(DateTime, nullable=True)  # final stats pass after the event finished
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -46,7 +47,10 @@ class Match(Base):
 
 class EventPlayerStat(Base):
     __tablename__ = "event_player_stats"
-    
+    __table_args__ = (
+        Index('uq_event_player_stats_event_id_player_name', 'event_id', 'player_name', unique=True),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False, index=True)
     player_name = Column(String, nullable=False)
@@ -63,6 +67,9 @@ class EventPlayerStat(Base):
 
 class EventTeamStat(Base):
     __tablename__ = "event_team_stats"
+    __table_args__ = (
+        Index('uq_event_team_stats_event_id_team_name', 'event_id', 'team_name', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False, index=True)
@@ -76,8 +83,30 @@ class EventTeamStat(Base):
 
     event = relationship("Event", back_populates="team_stats")
 
+class EventTeamMapStat(Base):
+    """Map-based team stats scraped from HLTV /stats/teams (standings stay match-derived in event_team_stats)"""
+    __tablename__ = "event_team_map_stats"
+    __table_args__ = (
+        Index('uq_event_team_map_stats_event_id_team_name', 'event_id', 'team_name', unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
+    team_name = Column(String, nullable=False)
+    team_logo = Column(String)
+    wins = Column(Integer)  # maps won
+    losses = Column(Integer)  # maps lost
+    win_rate = Column(Numeric(5, 2))
+    maps_played = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    event = relationship("Event")
+
 class EventHighlight(Base):
     __tablename__ = "event_highlights"
+    __table_args__ = (
+        Index('uq_event_highlights_event_id_highlight_id', 'event_id', 'highlight_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False, index=True)
@@ -98,3 +127,109 @@ class EventHighlight(Base):
 
     # Relationship
     event = relationship("Event", back_populates="highlights")
+
+class ScrapeTask(Base):
+    """Durable unit of scrape work, claimed by workers with FOR UPDATE SKIP LOCKED"""
+    __tablename__ = "scrape_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # event_list, event_results, player_stats, team_stats, event_stats, highlights, finalize_stats
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True, index=True)
+    priority = Column(Integer, nullable=False, default=0)  # higher runs first
+    not_before = Column(DateTime, nullable=False, default=datetime.utcnow)
+    status = Column(String, nullable=False, default='pending')  # pending, running, done, failed, superseded
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    last_error = Column(Text, nullable=True)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)  # start of the current (or last) attempt
+    finished_at = Column(DateTime, nullable=True)  # set when done or failed
+    result = Column(JSON, nullable=True)  # handler summary of a done task
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    event = relationship("Event")
+
+# Claim order for pending tasks
+Index(
+    'ix_scrape_tasks_claim',
+    ScrapeTask.priority.desc(),
+    ScrapeTask.not_before,
+    postgresql_where=ScrapeTask.status == 'pending'
+)
+# At most one pending task per (kind, event); re-enqueueing updates it instead
+Index(
+    'uq_scrape_tasks_pending_key',
+    ScrapeTask.kind,
+    func.coalesce(ScrapeTask.event_id, 0),
+    unique=True,
+    postgresql_where=ScrapeTask.status == 'pending'
+)
+
+class BackfillRun(Base):
+    """Archive enumeration cursor of a named historical backfill"""
+    __tablename__ = "backfill_runs"
+
+    name = Column(String, primary_key=True)
+    archive_offset = Column(Integer, nullable=False, default=0)  # next archive page to read
+    archive_done_at = Column(DateTime, nullable=True)
+    # Date range the archive cursor walks; a run can't be resumed with another range
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class BackfillCheckpoint(Base):
+    """Per-event backfill progress; each stage is stamped in the transaction that stores its data"""
+    __tablename__ = "backfill_checkpoints"
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    run_name = Column(String, ForeignKey("backfill_runs.name", ondelete="CASCADE"), nullable=False, index=True)
+    results_done_at = Column(DateTime, nullable=True)
+    player_stats_done_at = Column(DateTime, nullable=True)
+    team_stats_done_at = Column(DateTime, nullable=True)
+    highlights_done_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    event = relationship("Event")
+
+
+class SyncFailure(Base):
+    """Dead letter for a failing per-event sync: latest error, consecutive failures and next retry"""
+    __tablename__ = "sync_failures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # scrape task kind, e.g. event_results, highlights
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True, index=True)
+    error_class = Column(String, nullable=False)
+    last_error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=1)  # consecutive failures since the last success
+    first_failed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_failed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    next_retry_at = Column(DateTime, nullable=False)
+    dead_lettered_at = Column(DateTime, nullable=True)  # set when its scrape task gave up; cleared on requeue
+
+    event = relationship("Event")
+
+# One failure row per (kind, event); repeated failures update it
+Index(
+    'uq_sync_failures_key',
+    SyncFailure.kind,
+    func.coalesce(SyncFailure.event_id, 0),
+    unique=True
+)
+
+class CircuitState(Base):
+    """Latest circuit breaker state of one host, as published by one scraping process"""
+    __tablename__ = "circuit_states"
+
+    process = Column(String, primary_key=True)  # hostname:pid
+    host = Column(String, primary_key=True)  # e.g. www.hltv.org
+    state = Column(String, nullable=False)  # closed, open, half_open
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    opened_at = Column(DateTime, nullable=True)
+    probe_after = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -0,0 +1,138 @@
+"""
+In-process cache of serialized event overlay payloads
+
+GET /api/events/{slug}/overlay is polled by every stream overlay, but its
+data only changes when a sync job or an admin endpoint commits. Payloads are
+kept as JSON bytes per (slug, limits) in a bounded LRU with a TTL; concurrent
+misses for the same key share one database load. Writers invalidate the
+event's entries after committing.
+
+The TTL bounds staleness for writes made by other processes (e.g. a separate
+jobs.worker), which can't invalidate this process's entries.
+
+Configured by OVERLAY_CACHE_TTL (seconds an entry is served, 0 disables) and
+OVERLAY_CACHE_MAX_ENTRIES (see app.config).
+"""
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+from app.config import get_settings
+
+
+class OverlayCache:
+    """Thread-safe LRU/TTL cache with single-flight loading and per-event invalidation"""
+
+    def __init__(self, ttl: float = 10.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, event_id, slug, body)
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, str, bytes]]" = OrderedDict()
+        self._loading: Dict[Hashable, Future] = {}
+        # Bumped by every invalidation; loads that started before one are not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Tuple[int, str, bytes]]) -> bytes:
+        """
+        Return the cached body for key, or load it once for all concurrent callers
+
+        Args:
+            load: Returns (event_id, slug, body); exceptions reach every waiting caller
+        """
+        if not self.enabled:
+            return load()[2]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[3]
+
+            self.misses += 1
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[key] = future
+                generation = self._generation
+
+        if not owner:
+            return future.result()
+
+        try:
+            event_id, slug, body = load()
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._loading.pop(key, None)
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, event_id, slug, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(body)
+        return body
+
+    def invalidate(self, event_id: Optional[int] = None, slug: Optional[str] = None) -> int:
+        """Drop every entry of an event (by internal ID or slug); returns entries dropped"""
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, (_, entry_event_id, entry_slug, _) in self._entries.items()
+                if (event_id is not None and entry_event_id == event_id) or (slug is not None and entry_slug == slug)
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Size and hit counts, for status endpoints"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+_cache: Optional[OverlayCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_overlay_cache() -> OverlayCache:
+    """Return the process-wide overlay cache configured from settings"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            settings = get_settings()
+            _cache = OverlayCache(
+                ttl=settings.overlay_cache_ttl,
+                max_entries=settings.overlay_cache_max_entries,
+            )
+        return _cache
+
+
+def invalidate_event_overlay(event_id: Optional[int] = None, slug: Optional[str] = None):
+    """Drop the cached overlays of an event after a commit that changed it"""
+    get_overlay_cache().invalidate(event_id=event_id, slug=slug)
@@ -6,12 +6,14 @@ from scrapers.event_highlights import EventHighlightsScraper
 
 scraper = EventHighlightsScraper()
 url = f"{scraper.base_url}/events/8042/starladder-budapest-major-2025"
-soup = scraper.fetch(url)
+html = scraper.fetch(url)
 
-if not soup:
+if not html:
     print("Failed to fetch page")
     sys.exit(1)
 
+soup = scraper.make_soup(html, full_page=True)
+
 # Find event-highlights section
 highlights_section = soup.find('div', class_='event-highlights')
 
@@ -1,17 +1,21 @@
 """
 Debug script to inspect HTML structure of HLTV event page
+
+Set SCRAPER_CACHE=on (or replay) to re-run against cached responses.
 """
 import sys
 from scrapers.event_highlights import EventHighlightsScraper
 
 scraper = EventHighlightsScraper()
 url = f"{scraper.base_url}/events/8042/starladder-budapest-major-2025"
-soup = scraper.fetch(url)
+html = scraper.fetch(url)
 
-if not soup:
+if not html:
     print("Failed to fetch page")
     sys.exit(1)
 
+soup = scraper.make_soup(html, full_page=True)
+
 # Look for anything related to "highlight"
 print("\n" + "="*60)
 print("SEARCHING FOR HIGHLIGHT-RELATED ELEMENTS")
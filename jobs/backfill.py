@@ -0,0 +1,341 @@
+"""
+Resumable historical backfill from the HLTV events archive
+
+Walks /events/archive (newest first), stores every archived event, then
+fetches results, player stats, team stats and highlights for each one.
+Progress is checkpointed in the database - the archive cursor per run and
+a timestamp per event stage, written in the same transaction as the
+stage's data - so an interrupted run resumes where it stopped.
+
+Every request counts against a budget (--max-requests); responses already
+in the response cache are free. Throughput is bounded by the shared
+per-host rate limiter (SCRAPER_RATE_PER_HOST).
+
+Usage:
+    python -m jobs.backfill --start-date 2022-01-01 --end-date 2024-12-31 --max-requests 5000
+"""
+from datetime import date, datetime
+from typing import Iterable, Optional
+import argparse
+import sys
+
+from sqlalchemy import literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import BackfillCheckpoint, BackfillRun, Event, EventPlayerStat, EventTeamMapStat
+from jobs.sync_event_data import _store_event_matches
+from jobs.sync_highlights import _upsert_event_highlights
+from jobs.sync_stats import FINAL_CACHE_TTL, PLAYER_STAT_COLUMNS, TEAM_MAP_STAT_COLUMNS, _upsert_stats
+from scrapers.budget import RequestBudget, RequestBudgetExhausted
+from scrapers.circuit_breaker import CircuitOpenError
+from scrapers.event_highlights import EventHighlightsScraper
+from scrapers.events_archive import ARCHIVE_PAGE_SIZE, EventsArchiveScraper
+from scrapers.parse_pool import shutdown_parse_pool
+from scrapers.session import close_session_pool
+from scrapers.stats_matches import MAX_RESULTS_PAGES, RESULTS_PAGE_SIZE, StatsMatchesScraper, unique_matches
+from scrapers.stats_players import StatsPlayersScraper
+from scrapers.stats_teams import StatsTeamsScraper
+
+
+STAGES = ('results', 'player_stats', 'team_stats', 'highlights')
+# Events whose stages keep failing are left alone after this many tries
+MAX_EVENT_ATTEMPTS = 3
+
+
+class StageFetchFailed(Exception):
+    """A page needed by a backfill stage could not be fetched"""
+
+
+class BackfillRangeMismatch(Exception):
+    """A run was resumed with a different date range than it was started with"""
+
+
+class Backfill:
+    """One named backfill run over a date range of the events archive"""
+
+    def __init__(
+        self,
+        name: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        budget: Optional[RequestBudget] = None,
+        stages: Iterable[str] = STAGES
+    ):
+        self.name = name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.budget = budget or RequestBudget()
+        self.stages = tuple(stage for stage in STAGES if stage in set(stages))
+
+        self.archive = EventsArchiveScraper()
+        self.matches = StatsMatchesScraper()
+        self.players = StatsPlayersScraper()
+        self.teams = StatsTeamsScraper()
+        self.highlights = EventHighlightsScraper()
+        for scraper in (self.archive, self.matches, self.players, self.teams, self.highlights):
+            scraper.request_budget = self.budget
+
+    # -- archive enumeration -------------------------------------------------
+
+    def _load_run(self, db: Session) -> BackfillRun:
+        """Create or resume the run; its archive offset only means something for its own date range"""
+        db.execute(pg_insert(BackfillRun).values(
+            name=self.name,
+            archive_offset=0,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        ).on_conflict_do_nothing())
+        run = db.get(BackfillRun, self.name)
+
+        if (run.start_date, run.end_date) != (self.start_date, self.end_date):
+            saved = f"{run.start_date or 'any'} to {run.end_date or 'any'}"
+            requested = f"{self.start_date or 'any'} to {self.end_date or 'any'}"
+            raise BackfillRangeMismatch(
+                f"Backfill '{self.name}' covers {saved}, not {requested}; "
+                f"use the same dates or another --name"
+            )
+        return run
+
+    def _store_archived_events(self, db: Session, events_data: list):
+        """Insert unseen events and their checkpoints with two bulk statements"""
+        now = datetime.utcnow()
+        rows = {
+            event_data['external_id']: {
+                'external_id': event_data['external_id'],
+                'slug': event_data['slug'],
+                'name': event_data['name'],
+                'start_date': event_data['start_date'],
+                'end_date': event_data['end_date'],
+                'prize_pool': event_data['prize_pool'],
+                'location': event_data['location'],
+                'status': event_data['status'],
+                'created_at': now,
+                'updated_at': now,
+            }
+            for event_data in events_data
+        }
+
+        # Events already tracked (or a clashing slug) are left as they are
+        db.execute(pg_insert(Event).values(list(rows.values())).on_conflict_do_nothing())
+
+        db.execute(
+            pg_insert(BackfillCheckpoint).from_select(
+                ['event_id', 'run_name', 'attempts', 'updated_at'],
+                select(Event.id, literal(self.name), literal(0), literal(now))
+                .where(Event.external_id.in_(list(rows)))
+            ).on_conflict_do_nothing()
+        )
+
+    def enumerate_archive(self):
+        """Walk the archive from the run's saved offset, storing events page by page"""
+        db = SessionLocal()
+
+        try:
+            run = self._load_run(db)
+            db.commit()
+
+            while run.archive_done_at is None:
+                page = self.archive.scrape_page(run.archive_offset, self.start_date, self.end_date)
+                if page is None:
+                    print(f"⚠️  Archive page at offset {run.archive_offset} failed, resuming there next run", file=sys.stderr)
+                    return
+
+                events_data, listed = page
+                if events_data:
+                    self._store_archived_events(db, events_data)
+                run.archive_offset += ARCHIVE_PAGE_SIZE
+                # Rows that failed to parse don't end the walk; only a short page does
+                if listed < ARCHIVE_PAGE_SIZE:
+                    run.archive_done_at = datetime.utcnow()
+
+                # The cursor only moves together with the events it covers
+                db.commit()
+                print(f"📚 Archive offset {run.archive_offset}: {len(events_data)} events", file=sys.stderr)
+
+            print(f"✅ Archive enumerated for backfill '{self.name}'", file=sys.stderr)
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # -- per-event stages ----------------------------------------------------
+
+    def _fetch(self, scraper, url: str) -> str:
+        html = scraper.fetch(url, cache_ttl=FINAL_CACHE_TTL)
+        if not html:
+            raise StageFetchFailed(url)
+        return html
+
+    def _stage_results(self, db: Session, event: Event):
+        matches_data = []
+        page = 0
+        while page < MAX_RESULTS_PAGES:
+            html = self._fetch(self.matches, self.matches.results_url(event.external_id, offset=page * RESULTS_PAGE_SIZE))
+            page_matches = self.matches.parse(html, event.external_id)
+            matches_data.extend(page_matches)
+            page += 1
+            if len(page_matches) < RESULTS_PAGE_SIZE:
+                break
+
+        summary = _store_event_matches(db, event, unique_matches(matches_data))
+        return f"{summary['new']} new, {summary['updated']} updated matches"
+
+    def _stage_player_stats(self, db: Session, event: Event):
+        html = self._fetch(self.players, self.players.stats_url(event.external_id))
+        summary = _upsert_stats(db, EventPlayerStat, 'player_name', PLAYER_STAT_COLUMNS, event, self.players.parse(html, event.external_id))
+        return f"{summary['new']} new, {summary['updated']} updated players"
+
+    def _stage_team_stats(self, db: Session, event: Event):
+        html = self._fetch(self.teams, self.teams.stats_url(event.external_id))
+        summary = _upsert_stats(db, EventTeamMapStat, 'team_name', TEAM_MAP_STAT_COLUMNS, event, self.teams.parse(html, event.external_id))
+        return f"{summary['new']} new, {summary['updated']} updated teams"
+
+    def _stage_highlights(self, db: Session, event: Event):
+        html = self._fetch(self.highlights, self.highlights.event_url(event.external_id, event.slug))
+        highlights = self.highlights.parse(html, event.external_id)
+        if not highlights:
+            return "no highlights"
+        result = _upsert_event_highlights(db, event, highlights)
+        return f"{result.inserted} new, {result.updated} updated highlights"
+
+    def _next_event_id(self, db: Session) -> Optional[int]:
+        """Newest archived event of this run with a pending stage"""
+        pending = [getattr(BackfillCheckpoint, f"{stage}_done_at").is_(None) for stage in self.stages]
+        stmt = (
+            select(BackfillCheckpoint.event_id)
+            .join(Event, Event.id == BackfillCheckpoint.event_id)
+            .where(
+                BackfillCheckpoint.run_name == self.name,
+                BackfillCheckpoint.attempts < MAX_EVENT_ATTEMPTS,
+                or_(*pending)
+            )
+            .order_by(Event.end_date.desc().nulls_last(), BackfillCheckpoint.event_id)
+            .limit(1)
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+    def process_event(self, db: Session, event_id: int):
+        """Run every pending stage of one event; each stage commits with its checkpoint"""
+        event = db.get(Event, event_id)
+        checkpoint = db.get(BackfillCheckpoint, event_id)
+        print(f"\n🔄 Backfilling {event.name} (ID: {event.external_id})", file=sys.stderr)
+
+        for stage in self.stages:
+            done_column = f"{stage}_done_at"
+            if getattr(checkpoint, done_column) is not None:
+                continue
+
+            try:
+                outcome = getattr(self, f"_stage_{stage}")(db, event)
+                setattr(checkpoint, done_column, datetime.utcnow())
+                db.commit()
+                print(f"  ✅ {stage}: {outcome}", file=sys.stderr)
+
+            except (RequestBudgetExhausted, CircuitOpenError):
+                db.rollback()
+                raise
+            except Exception as e:
+                db.rollback()
+                db.execute(
+                    update(BackfillCheckpoint)
+                    .where(BackfillCheckpoint.event_id == event_id)
+                    .values(attempts=BackfillCheckpoint.attempts + 1, last_error=f"{stage}: {type(e).__name__}: {e}"[:2000])
+                )
+                db.commit()
+                print(f"  ❌ {stage} failed: {e}", file=sys.stderr)
+                return
+
+        if all(getattr(checkpoint, f"{stage}_done_at") for stage in STAGES):
+            checkpoint.completed_at = datetime.utcnow()
+            # A backfilled event needs no final stats pass
+            event.stats_finalized_at = event.stats_finalized_at or checkpoint.completed_at
+            db.commit()
+
+    def process_events(self, max_events: Optional[int] = None) -> int:
+        """Process pending events newest first; returns the number processed"""
+        db = SessionLocal()
+        processed = 0
+
+        try:
+            while max_events is None or processed < max_events:
+                event_id = self._next_event_id(db)
+                if event_id is None:
+                    break
+                self.process_event(db, event_id)
+                processed += 1
+            return processed
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def run(self, max_events: Optional[int] = None):
+        """Enumerate the archive, then backfill events until done or out of budget"""
+        processed = 0
+        try:
+            self.enumerate_archive()
+            processed = self.process_events(max_events)
+            print(f"\n🎉 Backfill '{self.name}': {processed} events processed", file=sys.stderr)
+        except RequestBudgetExhausted as e:
+            print(f"\n⏸️  Backfill '{self.name}' paused: {e}. Run again to resume.", file=sys.stderr)
+        except CircuitOpenError as e:
+            print(f"\n⏸️  Backfill '{self.name}' paused, HLTV unavailable: {e}. Run again to resume.", file=sys.stderr)
+        finally:
+            print(f"📊 Requests made: {self.budget.spent}", file=sys.stderr)
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill historical HLTV events (resumable)")
+    parser.add_argument('--name', default='archive', help="Backfill run name; progress is kept per name")
+    parser.add_argument('--start-date', type=_parse_date, help="Only events from this date (YYYY-MM-DD)")
+    parser.add_argument('--end-date', type=_parse_date, help="Only events up to this date (YYYY-MM-DD)")
+    parser.add_argument(
+        '--max-requests',
+        type=int,
+        default=get_settings().backfill_max_requests,
+        help="Request budget for this invocation (0 = unlimited)"
+    )
+    parser.add_argument('--max-events', type=int, help="Stop after this many events")
+    parser.add_argument(
+        '--stages',
+        default=','.join(STAGES),
+        help=f"Comma-separated stages to run (default: {','.join(STAGES)})"
+    )
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    backfill = Backfill(
+        args.name,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        budget=RequestBudget(args.max_requests or None),
+        stages=stages
+    )
+    try:
+        backfill.run(args.max_events)
+    except BackfillRangeMismatch as e:
+        parser.error(str(e))
+    finally:
+        close_session_pool()
+        shutdown_parse_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Per-event match sync cadence
+
+Instead of polling every active event at one fixed interval, each event's
+next poll is derived from its status and the matches already stored for it:
+
+- match day in progress (a stored result whose match started in the last
+  few hours): every ~45 seconds
+- other ongoing events (or events starting within the next interval): every 10 minutes
+- upcoming events: every 3 hours
+
+/results only lists finished matches, so a recent result is the signal
+that more matches of the event are being played. The match sync job ticks
+often and only scrapes the events that are due.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+import threading
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from app.models import Event, Match
+
+
+LIVE_INTERVAL = timedelta(seconds=45)
+ONGOING_INTERVAL = timedelta(minutes=10)
+UPCOMING_INTERVAL = timedelta(hours=3)
+
+# How often the scheduler checks for due events
+TICK_SECONDS = 15
+
+# A result is listed once its match is over; Match.date is when the match
+# started, so a Bo3 often shows up 2-3 hours after its date
+RECENT_RESULT_WINDOW = timedelta(hours=6)
+
+
+def _match_day_event_ids(db: Session, event_ids: list, now: datetime) -> set:
+    """Events with a finished match that started within RECENT_RESULT_WINDOW"""
+    if not event_ids:
+        return set()
+
+    stmt = select(Match.event_id).where(
+        Match.event_id.in_(event_ids),
+        Match.status == 'finished',
+        Match.date.between(now - RECENT_RESULT_WINDOW, now)
+    ).distinct()
+    return set(db.execute(stmt).scalars().all())
+
+
+def poll_intervals(db: Session, events: Iterable[Event], now: Optional[datetime] = None) -> Dict[int, timedelta]:
+    """
+    Poll interval for each event (keyed by Event.id), from one query over its matches
+    """
+    now = now or datetime.utcnow()
+    events = list(events)
+    match_day = _match_day_event_ids(db, [event.id for event in events if event.status == 'ongoing'], now)
+
+    intervals = {}
+    for event in events:
+        if event.id in match_day:
+            intervals[event.id] = LIVE_INTERVAL
+        elif event.status == 'ongoing' or (event.start_date and event.start_date <= now + ONGOING_INTERVAL):
+            intervals[event.id] = ONGOING_INTERVAL
+        else:
+            intervals[event.id] = UPCOMING_INTERVAL
+    return intervals
+
+
+def results_priority(interval: timedelta) -> int:
+    """Scrape task priority for an event polled at this interval (match days first)"""
+    if interval <= LIVE_INTERVAL:
+        return 10
+    if interval <= ONGOING_INTERVAL:
+        return 5
+    return 0
+
+
+class SyncCadence:
+    """Thread-safe in-memory map of event id -> next time its matches should be polled"""
+
+    def __init__(self):
+        self._next_poll: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def due(self, events: Iterable[Event], now: Optional[datetime] = None) -> list:
+        """Events whose next poll time has passed (events never polled are due)"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            return [event for event in events if self._next_poll.get(event.id, now) <= now]
+
+    def schedule(self, intervals: Dict[int, timedelta], now: Optional[datetime] = None):
+        """Set each event's next poll to now + its interval"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            for event_id, interval in intervals.items():
+                self._next_poll[event_id] = now + interval
+
+    def retain(self, event_ids: Iterable[int]):
+        """Drop every event not in event_ids (e.g. events that have finished)"""
+        keep = set(event_ids)
+        with self._lock:
+            for event_id in list(self._next_poll):
+                if event_id not in keep:
+                    del self._next_poll[event_id]
+
+    def snapshot(self) -> Dict[int, str]:
+        """Next poll time per event id, for status endpoints"""
+        with self._lock:
+            return {event_id: next_poll.isoformat() for event_id, next_poll in self._next_poll.items()}
+
+
+_cadence = SyncCadence()
+
+
+def get_sync_cadence() -> SyncCadence:
+    """Return the process-wide match sync cadence"""
+    return _cadence
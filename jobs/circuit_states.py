@@ -0,0 +1,146 @@
+"""
+Circuit breaker states shared through the database
+
+Breakers are per process (see scrapers.circuit_breaker), and in a split
+deployment the API answering /scheduler/status never scrapes HLTV. Every
+process running scrape task workers therefore publishes its breakers'
+snapshots to circuit_states every few seconds; circuit_summary reads the
+recent rows from any process.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import threading
+import logging
+import socket
+import os
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import CircuitState
+from scrapers.circuit_breaker import get_circuit_breakers
+
+logger = logging.getLogger(__name__)
+
+
+PUBLISH_INTERVAL_SECONDS = 15.0
+# Rows not refreshed for this long belong to processes that stopped
+STALE_AFTER = timedelta(minutes=2)
+# ... and are deleted after this long
+FORGET_AFTER = timedelta(days=1)
+
+
+def process_name() -> str:
+    """Identifier of this process in circuit_states (hostname:pid)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def publish_circuit_states(db: Session, process: Optional[str] = None) -> int:
+    """
+    Upsert this process's breaker snapshots (the caller commits)
+
+    Returns:
+        Number of hosts published
+    """
+    process = process or process_name()
+    now = datetime.utcnow()
+    rows = [
+        {
+            'process': process,
+            'host': host,
+            'state': snapshot['state'],
+            'consecutive_failures': snapshot['consecutive_failures'],
+            'opened_at': _parse_time(snapshot['opened_at']),
+            'probe_after': _parse_time(snapshot['probe_after']),
+            'updated_at': now,
+        }
+        for host, snapshot in get_circuit_breakers().snapshot().items()
+    ]
+
+    if rows:
+        stmt = pg_insert(CircuitState).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CircuitState.process, CircuitState.host],
+            set_={
+                'state': stmt.excluded.state,
+                'consecutive_failures': stmt.excluded.consecutive_failures,
+                'opened_at': stmt.excluded.opened_at,
+                'probe_after': stmt.excluded.probe_after,
+                'updated_at': stmt.excluded.updated_at,
+            }
+        )
+        db.execute(stmt)
+
+    db.execute(
+        delete(CircuitState)
+        .where(CircuitState.updated_at < now - FORGET_AFTER)
+        .execution_options(synchronize_session=False)
+    )
+    return len(rows)
+
+
+def circuit_summary() -> Dict[str, List[dict]]:
+    """Recently published breaker states by host (one entry per scraping process), for status endpoints"""
+    db = SessionLocal()
+
+    try:
+        stmt = (
+            select(CircuitState)
+            .where(CircuitState.updated_at >= datetime.utcnow() - STALE_AFTER)
+            .order_by(CircuitState.host, CircuitState.process)
+        )
+        summary: Dict[str, List[dict]] = {}
+        for row in db.execute(stmt).scalars():
+            summary.setdefault(row.host, []).append({
+                "process": row.process,
+                "state": row.state,
+                "consecutive_failures": row.consecutive_failures,
+                "opened_at": row.opened_at.isoformat() if row.opened_at else None,
+                "probe_after": row.probe_after.isoformat() if row.probe_after else None,
+                "reported_at": row.updated_at.isoformat()
+            })
+        return summary
+    finally:
+        db.close()
+
+
+class CircuitStatePublisher:
+    """Thread publishing this process's breaker states until stopped"""
+
+    def __init__(self, interval: float = PUBLISH_INTERVAL_SECONDS):
+        self.interval = interval
+        self.process = process_name()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="circuit-states", daemon=True)
+
+    def _publish(self):
+        db = SessionLocal()
+        try:
+            publish_circuit_states(db, self.process)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"[TASKS] Publishing circuit states failed: {e}")
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._publish()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        self._stop.set()
+        self._thread.join()
+        # Leave the final state behind (e.g. a circuit that opened just before shutdown)
+        self._publish()
@@ -0,0 +1,120 @@
+"""
+Scheduler leader election with a PostgreSQL advisory lock
+
+Every process that starts the scheduler competes for one session-level
+advisory lock; only the holder (the leader) runs scraping jobs. The lock
+lives on a dedicated connection, so it is released automatically if the
+leader process dies or loses its database connection.
+"""
+from typing import Optional
+import threading
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.config import get_settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerLeader:
+    """Holds (or keeps trying to take) the scheduler advisory lock"""
+
+    def __init__(self, lock_key: int):
+        self.lock_key = lock_key
+        self._connection: Optional[Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def _drop_connection(self):
+        """Forget the lock connection (caller holds the lock)"""
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+    def refresh(self) -> bool:
+        """
+        Confirm leadership if we hold the lock, otherwise try to take it
+
+        Returns:
+            Whether this process is the leader
+        """
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    # The lock is only as alive as the connection holding it
+                    self._connection.execute(text("SELECT 1"))
+                    self._connection.commit()
+                    return True
+                except Exception as e:
+                    logger.warning(f"[LEADER] Lost scheduler lock connection: {e}")
+                    self._drop_connection()
+
+            connection = None
+            try:
+                connection = engine.connect()
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+                ).scalar()
+                # Session-level locks survive the commit; don't sit idle in a transaction
+                connection.commit()
+            except Exception as e:
+                logger.warning(f"[LEADER] Could not try the scheduler lock: {e}")
+                if connection is not None:
+                    connection.close()
+                return False
+
+            if not acquired:
+                connection.close()
+                return False
+
+            # Detach so the pool never hands this connection (and its lock) to anyone else
+            connection.detach()
+            self._connection = connection
+            logger.info(f"[LEADER] This process is now the scheduler leader (lock {self.lock_key})")
+            return True
+
+    def leader_active(self) -> bool:
+        """Whether any process (this one or another) holds the scheduler lock"""
+        # A bigint advisory key is shown in pg_locks split into two 32-bit halves
+        stmt = text(
+            "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND granted "
+            "AND classid = :high AND objid = :low AND objsubid = 1)"
+        )
+        with engine.connect() as connection:
+            return bool(connection.execute(
+                stmt, {"high": (self.lock_key >> 32) & 0xFFFFFFFF, "low": self.lock_key & 0xFFFFFFFF}
+            ).scalar())
+
+    def release(self):
+        """Give up leadership (used on shutdown)"""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+                self._connection.commit()
+            except Exception as e:
+                logger.warning(f"[LEADER] Could not release the scheduler lock: {e}")
+            self._drop_connection()
+            logger.info("[LEADER] Released scheduler leadership")
+
+
+_leader: Optional[SchedulerLeader] = None
+_leader_lock = threading.Lock()
+
+
+def get_scheduler_leader() -> SchedulerLeader:
+    """Return the process-wide scheduler leader"""
+    global _leader
+    with _leader_lock:
+        if _leader is None:
+            _leader = SchedulerLeader(get_settings().scheduler_lock_key)
+        return _leader
@@ -4,41 +4,86 @@ APScheduler configuration and job management
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
+from functools import wraps
 import logging
 from datetime import datetime
 
+from .cadence import TICK_SECONDS
+from .leader import get_scheduler_leader
+
 logger = logging.getLogger(__name__)
 
 scheduler = BackgroundScheduler()
 
+LEADER_CHECK_SECONDS = 15
+STATUS_UPDATE_MINUTES = 10
+
+
+def leader_only(job):
+    """Skip the job unless this process holds the scheduler lock"""
+    @wraps(job)
+    def run():
+        if not get_scheduler_leader().is_leader:
+            logger.debug(f"[CRON] Skipping {job.__name__}: not the scheduler leader")
+            return
+        return job()
+    return run
+
 
+def leader_election_job():
+    """Job to confirm or take scheduler leadership"""
+    get_scheduler_leader().refresh()
+
+
+@leader_only
 def sync_matches_job():
-    """Job to sync matches for all active events"""
-    from .sync_event_data import sync_all_event_matches
+    """Job to queue match syncs for the active events that are due (see jobs.cadence)"""
+    from .sync_event_data import enqueue_due_event_matches
+
+    try:
+        queued = enqueue_due_event_matches()
+        if queued:
+            logger.info(f"[CRON] Queued match sync for {queued} events")
+    except Exception as e:
+        logger.error(f"[CRON] Queueing match syncs failed: {e}", exc_info=True)
+
+
+@leader_only
+def update_event_statuses_job():
+    """Job to move events between upcoming, ongoing and finished by their dates"""
+    from .sync_event_data import update_event_statuses
 
-    logger.info(f"[CRON] Starting match sync job at {datetime.utcnow()}")
+    logger.info(f"[CRON] Starting event status update at {datetime.utcnow()}")
     try:
-        sync_all_event_matches()
-        logger.info("[CRON] Match sync completed successfully")
+        changed = update_event_statuses()
+        logger.info(f"[CRON] Event status update completed ({len(changed)} changed)")
     except Exception as e:
-        logger.error(f"[CRON] Match sync failed: {e}", exc_info=True)
+        logger.error(f"[CRON] Event status update failed: {e}", exc_info=True)
 
 
+@leader_only
 def sync_events_job():
-    """Job to sync new events"""
-    from .sync_event_data import sync_events
+    """Job to queue a sync of new events"""
+    from .task_queue import EVENT_LIST, enqueue_task
+    from app.database import SessionLocal
 
-    logger.info(f"[CRON] Starting events sync job at {datetime.utcnow()}")
+    logger.info(f"[CRON] Queueing events sync at {datetime.utcnow()}")
+    db = SessionLocal()
     try:
-        sync_events()
-        logger.info("[CRON] Events sync completed successfully")
+        enqueue_task(db, EVENT_LIST, priority=3)
+        db.commit()
     except Exception as e:
-        logger.error(f"[CRON] Events sync failed: {e}", exc_info=True)
+        db.rollback()
+        logger.error(f"[CRON] Queueing events sync failed: {e}", exc_info=True)
+    finally:
+        db.close()
 
 
+@leader_only
 def sync_highlights_job():
-    """Job to sync highlights for ongoing and recently finished events"""
-    from .sync_highlights import sync_event_highlights
+    """Job to queue highlight syncs for ongoing and recently finished events"""
+    from .task_queue import HIGHLIGHTS, enqueue_task
+    from .sync_failures import backing_off_event_ids
     from app.models import Event
     from app.database import SessionLocal
     from sqlalchemy import select, or_
@@ -51,44 +96,113 @@ def sync_highlights_job():
         # Get ongoing events and recently finished events (last 7 days)
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
 
-        stmt = select(Event).where(
+        stmt = select(Event.id).where(
             or_(
                 Event.status == 'ongoing',
                 Event.status == 'finished'
             ),
             Event.end_date >= seven_days_ago
         )
-        events = db.execute(stmt).scalars().all()
-
-        logger.info(f"[CRON] Found {len(events)} events to sync highlights")
+        event_ids = db.execute(stmt).scalars().all()
 
-        synced_count = 0
-        for event in events:
-            try:
-                logger.info(f"[CRON] Syncing highlights for: {event.name} (ID: {event.external_id})")
-                sync_event_highlights(event.external_id, event.slug)
-                synced_count += 1
-            except Exception as e:
-                logger.error(f"[CRON] Failed to sync highlights for {event.name}: {e}")
-                continue
+        # Each event is its own task: one failing event is retried without holding up the rest
+        backing_off = backing_off_event_ids(db, HIGHLIGHTS)
+        for event_id in event_ids:
+            if event_id not in backing_off:
+                enqueue_task(db, HIGHLIGHTS, event_id, priority=1)
+        db.commit()
 
-        logger.info(f"[CRON] Highlights sync completed: {synced_count}/{len(events)} events synced")
+        logger.info(f"[CRON] Queued highlights sync for {len(event_ids)} events")
 
     except Exception as e:
+        db.rollback()
         logger.error(f"[CRON] Highlights sync job failed: {e}", exc_info=True)
     finally:
         db.close()
 
 
+@leader_only
+def sync_stats_job():
+    """Job to queue stats syncs for ongoing events and final passes for finished ones"""
+    from .sync_stats import enqueue_event_stats
+
+    try:
+        queued = enqueue_event_stats()
+        logger.info(
+            f"[CRON] Queued stats sync for {queued['ongoing']} ongoing events, "
+            f"final pass for {queued['finalize']} finished events"
+        )
+    except Exception as e:
+        logger.error(f"[CRON] Queueing stats syncs failed: {e}", exc_info=True)
+
+
+@leader_only
+def retry_failed_syncs_job():
+    """Job to queue retries of dead-lettered syncs whose backoff has elapsed"""
+    from .task_queue import requeue_dead_letters
+
+    try:
+        requeued = requeue_dead_letters()
+        if requeued:
+            logger.info(f"[CRON] Queued retries for {requeued} failed syncs")
+    except Exception as e:
+        logger.error(f"[CRON] Queueing failed sync retries failed: {e}", exc_info=True)
+
+
+@leader_only
+def prune_tasks_job():
+    """Job to delete old finished scrape tasks"""
+    from .task_queue import prune_tasks
+
+    try:
+        logger.info(f"[CRON] Pruned {prune_tasks()} old scrape tasks")
+    except Exception as e:
+        logger.error(f"[CRON] Pruning scrape tasks failed: {e}", exc_info=True)
+
+
 def start_scheduler():
     """Start the APScheduler with all configured jobs"""
 
-    # Job 1: Sync matches every 10 minutes
+    # Leader election: every process schedules the jobs, only the lock holder runs them
+    leader = get_scheduler_leader()
+    leader.refresh()
+    scheduler.add_job(
+        leader_election_job,
+        trigger=IntervalTrigger(seconds=LEADER_CHECK_SECONDS),
+        id='leader_election',
+        name='Scheduler leader election',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=LEADER_CHECK_SECONDS,
+        replace_existing=True
+    )
+
+    # Every job: a run still in progress is never started twice (max_instances),
+    # runs missed while busy collapse into one (coalesce), and runs later than
+    # misfire_grace_time are skipped rather than fired late
+
+    # Job 1: Check for events due a match sync; each event has its own cadence
     scheduler.add_job(
         sync_matches_job,
-        trigger=IntervalTrigger(minutes=10),
+        trigger=IntervalTrigger(seconds=TICK_SECONDS),
         id='sync_matches',
         name='Sync event matches',
+        max_instances=1,
+        coalesce=True,
+        # A late tick is pointless once the next one is due
+        misfire_grace_time=TICK_SECONDS,
+        replace_existing=True
+    )
+
+    # Job 1b: Event statuses follow their dates; checked at the old match sync frequency
+    scheduler.add_job(
+        update_event_statuses_job,
+        trigger=IntervalTrigger(minutes=STATUS_UPDATE_MINUTES),
+        id='update_event_statuses',
+        name='Update event statuses',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
         replace_existing=True
     )
 
@@ -98,6 +212,9 @@ def start_scheduler():
         trigger=CronTrigger(hour=0, minute=0),
         id='sync_events',
         name='Sync events daily',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=3600,
         replace_existing=True
     )
 
@@ -107,14 +224,58 @@ def start_scheduler():
         trigger=CronTrigger(hour=4, minute=0),
         id='sync_highlights',
         name='Sync event highlights',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=3600,
+        replace_existing=True
+    )
+
+    # Job 4: Player/team stats for ongoing events, final pass for finished ones
+    scheduler.add_job(
+        sync_stats_job,
+        trigger=IntervalTrigger(minutes=30),
+        id='sync_stats',
+        name='Sync event player and team stats',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=600,
+        replace_existing=True
+    )
+
+    # Job 5: Retry dead-lettered syncs on their own backoff, independent of the jobs above
+    scheduler.add_job(
+        retry_failed_syncs_job,
+        trigger=IntervalTrigger(minutes=1),
+        id='retry_failed_syncs',
+        name='Retry failed syncs',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
+        replace_existing=True
+    )
+
+    # Job 6: Delete old finished scrape tasks daily at 05:00 UTC
+    scheduler.add_job(
+        prune_tasks_job,
+        trigger=CronTrigger(hour=5, minute=0),
+        id='prune_scrape_tasks',
+        name='Prune scrape tasks',
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=3600,
         replace_existing=True
     )
 
     scheduler.start()
     logger.info("✅ APScheduler started with jobs:")
-    logger.info("  - sync_matches: Every 10 minutes")
+    logger.info(f"  - sync_matches: Every {TICK_SECONDS}s (match days ~45s, ongoing 10min, upcoming 3h)")
+    logger.info(f"  - update_event_statuses: Every {STATUS_UPDATE_MINUTES} minutes")
     logger.info("  - sync_events: Daily at 00:00 UTC")
     logger.info("  - sync_highlights: Daily at 04:00 UTC")
+    logger.info("  - sync_stats: Every 30 minutes")
+    logger.info("  - retry_failed_syncs: Every minute")
+    logger.info("  - prune_scrape_tasks: Daily at 05:00 UTC")
+    logger.info(f"  - leader_election: Every {LEADER_CHECK_SECONDS}s (leader: {leader.is_leader})")
 
 
 def shutdown_scheduler():
@@ -122,3 +283,4 @@ def shutdown_scheduler():
     if scheduler.running:
         scheduler.shutdown()
         logger.info("APScheduler shut down")
+    get_scheduler_leader().release()
@@ -1,162 +1,418 @@
 """
 Event data synchronization jobs
 """
+import asyncio
 import sys
-from datetime import datetime, timezone
+from collections import Counter
+from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import and_, case, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.database import SessionLocal
 from app.models import Event, Match
+from app.overlay_cache import get_overlay_cache, invalidate_event_overlay
+from scrapers.async_engine import AsyncFetchEngine
 from scrapers.base import BaseScraper
+from scrapers.event_details import EventDetailsScraper
 from scrapers.stats_events import StatsEventsScraper
-from scrapers.stats_matches import StatsMatchesScraper
-
-
-def update_event_statuses():
+from scrapers.stats_matches import (
+    MAX_RESULTS_PAGES,
+    RESULTS_PAGE_SIZE,
+    StatsMatchesScraper,
+    unique_matches,
+)
+from jobs.cadence import get_sync_cadence, poll_intervals, results_priority
+from jobs.sync_failures import backing_off_event_ids, clear_failure
+from jobs.task_queue import EVENT_RESULTS, enqueue_task
+from jobs.team_stats import apply_team_stat_deltas, team_stat_deltas
+
+
+def update_event_statuses() -> list:
     """
     Automatically update event statuses based on dates:
     - If end_date passed -> 'finished'
     - If between start_date and end_date -> 'ongoing'
     - If before start_date -> 'upcoming'
+
+    Runs as a single UPDATE ... FROM ... RETURNING; only rows whose status
+    actually changes are written.
+
+    Returns:
+        Slugs of the events whose status changed
     """
     db = SessionLocal()
 
     try:
-        now = datetime.now(timezone.utc)
+        # Dates are stored as naive UTC
+        now = datetime.utcnow()
+
+        new_status = case(
+            (Event.end_date < now, 'finished'),
+            (and_(Event.start_date.isnot(None), Event.start_date <= now), 'ongoing'),
+            (Event.start_date > now, 'upcoming'),
+            else_=Event.status
+        )
+        computed = (
+            select(Event.id, Event.status.label('old_status'), new_status.label('new_status'))
+            .where(Event.end_date.isnot(None))
+            .subquery('computed')
+        )
+        stmt = (
+            update(Event)
+            .where(
+                Event.id == computed.c.id,
+                computed.c.new_status.is_distinct_from(computed.c.old_status)
+            )
+            .values(status=computed.c.new_status, updated_at=now)
+            .returning(Event.slug, Event.name, computed.c.old_status, Event.status)
+            .execution_options(synchronize_session=False)
+        )
+
+        print(f"🔄 Checking event statuses", file=sys.stderr)
+
+        changed = db.execute(stmt).all()
+        db.commit()
 
-        # Get all events with dates
-        stmt = select(Event).where(Event.end_date.isnot(None))
-        events = db.execute(stmt).scalars().all()
+        for row in changed:
+            invalidate_event_overlay(slug=row.slug)
+            print(f"  📝 {row.name}: {row.old_status} → {row.status}", file=sys.stderr)
 
-        print(f"🔄 Checking status for {len(events)} events", file=sys.stderr)
+        if changed:
+            print(f"✅ Updated {len(changed)} event statuses", file=sys.stderr)
+        else:
+            print(f"✅ All event statuses are up to date", file=sys.stderr)
 
-        updated_count = 0
+        return [row.slug for row in changed]
 
-        for event in events:
-            old_status = event.status
-            new_status = old_status
-
-            # Make dates timezone-aware for comparison
-            end_date = event.end_date.replace(tzinfo=timezone.utc) if event.end_date else None
-            start_date = event.start_date.replace(tzinfo=timezone.utc) if event.start_date else None
-
-            # Determine new status based on dates
-            if end_date and now > end_date:
-                new_status = 'finished'
-            elif start_date and end_date and start_date <= now <= end_date:
-                new_status = 'ongoing'
-            elif start_date and now < start_date:
-                new_status = 'upcoming'
-
-            # Update if status changed
-            if new_status != old_status:
-                event.status = new_status
-                event.updated_at = datetime.utcnow()
-                updated_count += 1
-                print(f"  📝 {event.name}: {old_status} → {new_status}", file=sys.stderr)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error updating event statuses: {e}", file=sys.stderr)
+        raise
+    finally:
+        db.close()
 
-        db.commit()
 
-        if updated_count > 0:
-            print(f"✅ Updated {updated_count} event statuses", file=sys.stderr)
-        else:
-            print(f"✅ All event statuses are up to date", file=sys.stderr)
+# Match columns refreshed from HLTV on every sync
+MATCH_SYNC_COLUMNS = (
+    'team1_name',
+    'team1_logo',
+    'team2_name',
+    'team2_logo',
+    'team1_score',
+    'team2_score',
+    'date',
+    'map',
+    'status',
+)
+
+
+def _load_current_matches(db: Session, external_ids: list) -> dict:
+    """
+    Current synced columns of the given matches in one query, keyed by external_id
+
+    The rows stay locked until commit so standings deltas computed from them
+    can't race with another sync of the same matches.
+    """
+    if not external_ids:
+        return {}
+
+    columns = [getattr(Match, column) for column in MATCH_SYNC_COLUMNS]
+    stmt = (
+        select(Match.external_id, *columns)
+        .where(Match.external_id.in_(external_ids))
+        .with_for_update()
+    )
+    return {
+        row.external_id: {column: getattr(row, column) for column in MATCH_SYNC_COLUMNS}
+        for row in db.execute(stmt)
+    }
+
+
+def _store_event_matches(db: Session, event: Event, matches_data: list) -> dict:
+    """
+    Write only new or changed matches for one event
+
+    Scraped rows are diffed against the stored ones field by field; the
+    remaining rows are upserted in a single INSERT ... ON CONFLICT. Matches
+    that finish or whose result changes adjust the event's team standings
+    in the same transaction.
+
+    Returns:
+        Dict with new, updated and unchanged counts, changed_columns
+        (column name -> number of matches where it changed) and
+        teams_adjusted (standings rows written)
+    """
+    summary = {'new': 0, 'updated': 0, 'unchanged': 0, 'changed_columns': Counter(), 'teams_adjusted': 0}
+    if not matches_data:
+        return summary
+
+    now = datetime.utcnow()
+    rows = []
+    for match_data in unique_matches(matches_data):
+        row = {column: match_data.get(column) for column in MATCH_SYNC_COLUMNS}
+        row['status'] = match_data.get('status', 'upcoming')
+        row['external_id'] = match_data['external_id']
+        rows.append(row)
+
+    current = _load_current_matches(db, [row['external_id'] for row in rows])
+
+    changed_rows = []
+    for row in rows:
+        existing = current.get(row['external_id'])
+        if existing is not None:
+            changed = [column for column in MATCH_SYNC_COLUMNS if existing[column] != row[column]]
+            if not changed:
+                summary['unchanged'] += 1
+                continue
+            summary['changed_columns'].update(changed)
+
+        row.update(event_id=event.id, created_at=now, updated_at=now)
+        changed_rows.append(row)
+
+    if not changed_rows:
+        return summary
+
+    stmt = pg_insert(Match).values(changed_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Match.external_id],
+        set_={column: stmt.excluded[column] for column in MATCH_SYNC_COLUMNS + ('updated_at',)},
+        # Guard against rows that changed between the diff query and the write
+        where=or_(*[getattr(Match, column).is_distinct_from(stmt.excluded[column]) for column in MATCH_SYNC_COLUMNS])
+    ).returning(
+        Match.external_id,
+        # xmax is 0 only for freshly inserted row versions
+        literal_column('xmax = 0').label('inserted')
+    )
+
+    results = db.execute(stmt).all()
+    summary['new'] = sum(1 for result in results if result.inserted)
+    summary['updated'] = len(results) - summary['new']
+    summary['unchanged'] += len(changed_rows) - len(results)
+
+    written = {result.external_id for result in results}
+    transitions = [
+        (current.get(row['external_id']), row)
+        for row in changed_rows if row['external_id'] in written
+    ]
+    summary['teams_adjusted'] = apply_team_stat_deltas(db, event.id, team_stat_deltas(transitions))
+    return summary
+
+
+def _known_finished_match_ids(db: Session, event: Event) -> set:
+    """External IDs of the event's matches already stored as finished"""
+    stmt = select(Match.external_id).where(
+        Match.event_id == event.id,
+        Match.status == 'finished'
+    )
+    return set(db.execute(stmt).scalars().all())
+
+
+class ResultsFetchError(Exception):
+    """An event's /results page could not be fetched"""
+
+
+async def _sync_matches_concurrently(db: Session, events: list) -> tuple:
+    """
+    Fetch every event's /results page in parallel and store each one as it arrives
+
+    Each event is its own transaction: a failing event is rolled back and
+    reported without losing the events stored before or after it. Events
+    whose pages are skipped by an open circuit fail with CircuitOpenError.
+
+    Returns:
+        (summaries, failures) mapping event ID to its summary dict or to its exception
+    """
+    # One scraper for the whole run - only its (process pool) parsing is used here
+    scraper = StatsMatchesScraper()
+
+    events_by_url = {scraper.results_url(event.external_id): event for event in events}
+
+    summaries = {}
+    failures = {}
+
+    # One session for the batch and every older page fetched during it
+    async with AsyncFetchEngine() as engine:
+        async for url, html, circuit_error in engine.fetch_many(events_by_url):
+            event = events_by_url[url]
+            print(f"\n🔄 Syncing matches for event: {event.name} (ID: {event.external_id})", file=sys.stderr)
+
+            if circuit_error is not None:
+                print(f"  ⛔ Skipped, HLTV circuit open: {circuit_error}", file=sys.stderr)
+                failures[event.id] = circuit_error
+                continue
+
+            if html is None:
+                print(f"  ❌ Failed to fetch matches for event {event.external_id}", file=sys.stderr)
+                failures[event.id] = ResultsFetchError(f"Failed to fetch {url}")
+                continue
+
+            try:
+                matches_data = await scraper.parse_async(html, event.external_id, url=url)
+                if matches_data is None:
+                    print(f"  ⏭️  Event {event.name}: results unchanged, skipping", file=sys.stderr)
+                    summaries[event.id] = {'new': 0, 'updated': 0, 'results_unchanged': True}
+                    continue
+
+                # Walk older pages until we reach matches that are already stored as finished
+                known_finished_ids = _known_finished_match_ids(db, event)
+                page_matches = matches_data
+                page = 1
+                complete = True
+                while page < MAX_RESULTS_PAGES and scraper.has_more_pages(page_matches, known_finished_ids):
+                    page_url = scraper.results_url(event.external_id, offset=page * RESULTS_PAGE_SIZE)
+                    page_html = await engine.fetch_url(page_url)
+                    if page_html is None:
+                        print(f"  ❌ Failed to fetch results page {page + 1} for event {event.external_id}", file=sys.stderr)
+                        complete = False
+                        break
+                    page_matches = await scraper.parse_async(page_html, event.external_id)
+                    matches_data.extend(page_matches)
+                    page += 1
+
+                matches_data = unique_matches(matches_data)
+                print(f"  📥 Scraped {len(matches_data)} matches from HLTV ({page} page(s))", file=sys.stderr)
+
+                summary = _store_event_matches(db, event, matches_data)
+                clear_failure(db, EVENT_RESULTS, event.id)
+                db.commit()
+                invalidate_event_overlay(event.id)
+                if not complete:
+                    # Keep what was fetched, but walk the older pages again next run
+                    # instead of skipping the event as unchanged
+                    scraper.fingerprints.forget(url)
+            except Exception as e:
+                db.rollback()
+                # Nothing was stored, so the next run must not treat this page as unchanged
+                scraper.fingerprints.forget(url)
+                print(f"  ❌ Error syncing matches for event {event.external_id}: {e}", file=sys.stderr)
+                failures[event.id] = e
+                continue
+
+            changed_columns = ', '.join(
+                f"{column}×{count}" for column, count in summary['changed_columns'].most_common()
+            )
+            print(
+                f"  ✅ Event {event.name}: {summary['new']} new, {summary['updated']} updated, "
+                f"{summary['unchanged']} unchanged" + (f" (changed: {changed_columns})" if changed_columns else "")
+                + (f", {summary['teams_adjusted']} team standings adjusted" if summary['teams_adjusted'] else ""),
+                file=sys.stderr
+            )
+            summaries[event.id] = {
+                'new': summary['new'],
+                'updated': summary['updated'],
+                'unchanged': summary['unchanged'],
+                'teams_adjusted': summary['teams_adjusted'],
+                'pages': page,
+            }
+
+    return summaries, failures
+
+
+def sync_matches_for_events(event_ids: list) -> dict:
+    """
+    Sync matches for a batch of events (by internal ID), fetching their results concurrently
+
+    Used by scrape workers, which claim due event_results tasks together.
+
+    Returns:
+        Dict mapping each event ID to its summary dict, to None if the event
+        doesn't exist, or to the exception its sync failed with
+    """
+    db = SessionLocal()
+
+    try:
+        events = db.execute(select(Event).where(Event.id.in_(set(event_ids)))).scalars().all()
+        outcomes = {event_id: None for event_id in event_ids}
+        if not events:
+            print(f"❌ Events {sorted(set(event_ids))} not found in database", file=sys.stderr)
+            return outcomes
+
+        summaries, failures = asyncio.run(_sync_matches_concurrently(db, events))
+        outcomes.update(summaries)
+        outcomes.update(failures)
+
+        print(
+            f"\n🎉 Match sync of {len(events)} events: "
+            f"{sum(summary['new'] for summary in summaries.values())} new matches, "
+            f"{sum(summary['updated'] for summary in summaries.values())} updated"
+            + (f", {len(failures)} events failed" if failures else ""),
+            file=sys.stderr
+        )
+        return outcomes
 
     except Exception as e:
         db.rollback()
-        print(f"❌ Error updating event statuses: {e}", file=sys.stderr)
+        print(f"❌ Error syncing matches for events {event_ids}: {e}", file=sys.stderr)
         raise
     finally:
         db.close()
 
 
-def sync_all_event_matches():
-    """Sync matches for all active events (ongoing or upcoming)"""
+def sync_event_matches(event_id: int) -> Optional[dict]:
+    """
+    Sync matches for a single event (by internal ID)
+
+    Returns:
+        Dict with new and updated match counts, or None if the event doesn't exist
+    """
+    outcome = sync_matches_for_events([event_id])[event_id]
+    if isinstance(outcome, Exception):
+        # Let the scrape task record the failure and retry it
+        raise outcome
+    return outcome
+
+
+def enqueue_due_event_matches() -> int:
+    """
+    Queue an event_results scrape task for every active event that is due
 
-    # First, update event statuses based on dates
-    print(f"\n🔄 Updating event statuses...", file=sys.stderr)
-    update_event_statuses()
+    Events with a match day in progress, then other ongoing events, get a
+    higher priority so they are claimed first when workers are busy. Event statuses are kept current by their own job
+    (update_event_statuses).
 
+    Returns:
+        Number of events queued
+    """
     db = SessionLocal()
+    cadence = get_sync_cadence()
 
     try:
-        # Get all events that are not finished
         stmt = select(Event).where(Event.status.in_(['upcoming', 'ongoing']))
-        events = db.execute(stmt).scalars().all()
-
-        print(f"\n📊 Found {len(events)} active events to sync", file=sys.stderr)
+        active_events = db.execute(stmt).scalars().all()
+        cadence.retain(event.id for event in active_events)
 
-        total_new = 0
-        total_updated = 0
+        # Failing events retry on their own backoff, not on the cadence
+        backing_off = backing_off_event_ids(db, EVENT_RESULTS)
+        events = [event for event in cadence.due(active_events) if event.id not in backing_off]
+        if not events:
+            return 0
 
+        intervals = poll_intervals(db, events)
         for event in events:
-            print(f"\n🔄 Syncing matches for event: {event.name} (ID: {event.external_id})", file=sys.stderr)
+            enqueue_task(db, EVENT_RESULTS, event.id, priority=results_priority(intervals[event.id]))
+        db.commit()
 
-            # Scrape matches for this event
-            scraper = StatsMatchesScraper()
-            matches_data = scraper.scrape(event.external_id)
-
-            print(f"  📥 Scraped {len(matches_data)} matches from HLTV", file=sys.stderr)
-
-            new_matches = 0
-            updated_matches = 0
-
-            for match_data in matches_data:
-                # Check if match already exists
-                existing_match = db.query(Match).filter(
-                    Match.external_id == match_data['external_id']
-                ).first()
-
-                if existing_match:
-                    # Update existing match
-                    existing_match.team1_name = match_data.get('team1_name')
-                    existing_match.team1_logo = match_data.get('team1_logo')
-                    existing_match.team2_name = match_data.get('team2_name')
-                    existing_match.team2_logo = match_data.get('team2_logo')
-                    existing_match.team1_score = match_data.get('team1_score')
-                    existing_match.team2_score = match_data.get('team2_score')
-                    existing_match.date = match_data.get('date')
-                    existing_match.map = match_data.get('map')
-                    existing_match.status = match_data.get('status', 'upcoming')
-                    existing_match.updated_at = datetime.utcnow()
-                    updated_matches += 1
-                else:
-                    # Create new match
-                    new_match = Match(
-                        external_id=match_data['external_id'],
-                        event_id=event.id,
-                        team1_name=match_data.get('team1_name'),
-                        team1_logo=match_data.get('team1_logo'),
-                        team2_name=match_data.get('team2_name'),
-                        team2_logo=match_data.get('team2_logo'),
-                        team1_score=match_data.get('team1_score'),
-                        team2_score=match_data.get('team2_score'),
-                        date=match_data.get('date'),
-                        map=match_data.get('map'),
-                        status=match_data.get('status', 'upcoming')
-                    )
-                    db.add(new_match)
-                    new_matches += 1
-
-            db.commit()
-
-            print(f"  ✅ Event {event.name}: {new_matches} new, {updated_matches} updated", file=sys.stderr)
-            total_new += new_matches
-            total_updated += updated_matches
-
-        print(f"\n🎉 Sync completed: {total_new} new matches, {total_updated} updated", file=sys.stderr)
+        cadence.schedule(intervals)
+        print(f"📬 Queued match sync for {len(events)} of {len(active_events)} active events", file=sys.stderr)
+        return len(events)
 
     except Exception as e:
         db.rollback()
-        print(f"❌ Error syncing matches: {e}", file=sys.stderr)
+        print(f"❌ Error queueing match syncs: {e}", file=sys.stderr)
         raise
     finally:
         db.close()
 
 
-def sync_events():
-    """Sync new events from HLTV"""
+def sync_events() -> dict:
+    """
+    Sync new events from HLTV
+
+    Returns:
+        Dict with new, updated and dated event counts
+    """
     db = SessionLocal()
 
     try:
@@ -170,6 +426,7 @@ def sync_events():
 
         new_events = 0
         updated_events = 0
+        details_scraper = None
 
         for event_data in events_data:
             # Check if event already exists
@@ -177,16 +434,27 @@ def sync_events():
                 Event.external_id == event_data['external_id']
             ).first()
 
+            # Without dates an event never leaves 'upcoming', so fall back to its own page
+            has_dates = event_data.get('start_date') and event_data.get('end_date')
+            has_stored_dates = existing_event is not None and existing_event.start_date and existing_event.end_date
+            if not has_dates and not has_stored_dates:
+                details_scraper = details_scraper or EventDetailsScraper()
+                details = details_scraper.scrape(event_data['external_id']) or {}
+                event_data['start_date'] = event_data.get('start_date') or details.get('start_date')
+                event_data['end_date'] = event_data.get('end_date') or details.get('end_date')
+
             if existing_event:
                 # Update existing event
                 existing_event.name = event_data.get('name')
                 existing_event.slug = event_data.get('slug')
-                existing_event.start_date = event_data.get('start_date')
-                existing_event.end_date = event_data.get('end_date')
+                # Keep known dates if this listing couldn't be parsed
+                existing_event.start_date = event_data.get('start_date') or existing_event.start_date
+                existing_event.end_date = event_data.get('end_date') or existing_event.end_date
                 existing_event.type = event_data.get('type')
                 existing_event.prize_pool = event_data.get('prize_pool')
                 existing_event.location = event_data.get('location')
-                existing_event.status = event_data.get('status', 'upcoming')
+                # Status is derived from the dates by update_event_statuses below
+                existing_event.status = existing_event.status or event_data.get('status', 'upcoming')
                 existing_event.updated_at = datetime.utcnow()
                 updated_events += 1
             else:
@@ -205,15 +473,39 @@ def sync_events():
                 db.add(new_event)
                 new_events += 1
 
+        # Active events that dropped off the listing without dates would be polled forever
+        undated_stmt = select(Event).where(
+            Event.status.in_(['upcoming', 'ongoing']),
+            or_(Event.start_date.is_(None), Event.end_date.is_(None)),
+            Event.external_id.notin_([event_data['external_id'] for event_data in events_data])
+        )
+        dated_events = 0
+        for event in db.execute(undated_stmt).scalars().all():
+            details_scraper = details_scraper or EventDetailsScraper()
+            details = details_scraper.scrape(event.external_id) or {}
+            if details.get('start_date') and details.get('end_date'):
+                event.start_date = details['start_date']
+                event.end_date = details['end_date']
+                event.updated_at = datetime.utcnow()
+                dated_events += 1
+
         db.commit()
+        # Names, dates and details of any listed event may have changed
+        get_overlay_cache().clear()
 
-        print(f"✅ Events sync completed: {new_events} new, {updated_events} updated", file=sys.stderr)
+        print(
+            f"✅ Events sync completed: {new_events} new, {updated_events} updated"
+            + (f", {dated_events} unlisted events dated" if dated_events else ""),
+            file=sys.stderr
+        )
 
         # Update statuses based on dates after syncing
         print(f"\n🔄 Updating event statuses...", file=sys.stderr)
         db.close()  # Close current session before calling update_event_statuses
         update_event_statuses()
 
+        return {'new': new_events, 'updated': updated_events, 'dated': dated_events}
+
     except Exception as e:
         db.rollback()
         print(f"❌ Error syncing events: {e}", file=sys.stderr)
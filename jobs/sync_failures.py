@@ -0,0 +1,141 @@
+"""
+Dead letter for failing per-event syncs
+
+Every failed sync of one (kind, event) - a scrape task, or one event of a
+batch match sync - is recorded in sync_failures with its error class, the
+number of consecutive failures and when to retry it. The retry delay
+doubles with each consecutive failure, so a broken event backs off on its
+own while healthy events keep their normal schedule. A success deletes
+the row.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import SyncFailure
+
+
+RETRY_BASE_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+# Failures older than this stay recorded for inspection but are no longer retried
+RETRY_WINDOW = timedelta(days=2)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Wait before the next try after the given number of consecutive failures"""
+    return min(MAX_RETRY_DELAY, RETRY_BASE_DELAY * (2 ** max(0, attempts - 1)))
+
+
+def _event_filter(event_id: Optional[int]):
+    return SyncFailure.event_id.is_(None) if event_id is None else SyncFailure.event_id == event_id
+
+
+def record_failure(db: Session, kind: str, event_id: Optional[int], error: Exception, dead_letter: bool = False) -> Row:
+    """
+    Record one failed sync (the caller commits)
+
+    Args:
+        dead_letter: The sync won't be retried by its own task; the failure
+            is requeued by requeue_dead_letters once next_retry_at is due
+
+    Returns:
+        Row with attempts (consecutive failures) and next_retry_at
+    """
+    now = datetime.utcnow()
+    stmt = pg_insert(SyncFailure).values(
+        kind=kind,
+        event_id=event_id,
+        error_class=type(error).__name__,
+        last_error=str(error)[:2000],
+        attempts=1,
+        first_failed_at=now,
+        last_failed_at=now,
+        next_retry_at=now + retry_delay(1),
+        dead_lettered_at=now if dead_letter else None
+    )
+    # Same backoff as retry_delay, from the stored count before this failure
+    backoff_seconds = func.least(
+        MAX_RETRY_DELAY.total_seconds(),
+        RETRY_BASE_DELAY.total_seconds() * func.power(2, SyncFailure.attempts)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncFailure.kind, func.coalesce(SyncFailure.event_id, 0)],
+        set_={
+            'error_class': stmt.excluded.error_class,
+            'last_error': stmt.excluded.last_error,
+            'attempts': SyncFailure.attempts + 1,
+            'last_failed_at': now,
+            'next_retry_at': stmt.excluded.last_failed_at + func.make_interval(0, 0, 0, 0, 0, 0, backoff_seconds),
+            'dead_lettered_at': stmt.excluded.dead_lettered_at,
+        }
+    ).returning(SyncFailure.attempts, SyncFailure.next_retry_at)
+
+    return db.execute(stmt).one()
+
+
+def clear_failure(db: Session, kind: str, event_id: Optional[int]):
+    """Forget a (kind, event)'s failures after a successful sync (the caller commits)"""
+    db.execute(
+        delete(SyncFailure)
+        .where(SyncFailure.kind == kind, _event_filter(event_id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def backing_off_event_ids(db: Session, kind: str, now: Optional[datetime] = None) -> set:
+    """
+    Events whose syncs of this kind must not be queued on schedule
+
+    That is events still waiting out their failure backoff (a retry is
+    queued for then, or the dead letter requeues them) and dead-lettered
+    events past RETRY_WINDOW. A manual trigger still reaches them.
+    """
+    now = now or datetime.utcnow()
+    stmt = select(SyncFailure.event_id).where(
+        SyncFailure.kind == kind,
+        SyncFailure.event_id.is_not(None),
+        or_(
+            SyncFailure.next_retry_at > now,
+            and_(SyncFailure.dead_lettered_at.is_not(None), SyncFailure.first_failed_at < now - RETRY_WINDOW)
+        )
+    )
+    return set(db.execute(stmt).scalars().all())
+
+
+def due_dead_letters(db: Session, now: Optional[datetime] = None) -> list:
+    """Dead-lettered failures whose retry is due, locked for requeueing"""
+    now = now or datetime.utcnow()
+    stmt = (
+        select(SyncFailure)
+        .where(
+            SyncFailure.dead_lettered_at.is_not(None),
+            SyncFailure.next_retry_at <= now,
+            SyncFailure.first_failed_at >= now - RETRY_WINDOW
+        )
+        .order_by(SyncFailure.next_retry_at)
+        .with_for_update(skip_locked=True)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def failure_summary() -> Dict[str, Dict[str, int]]:
+    """Failing and dead-lettered counts by kind, for status endpoints"""
+    db = SessionLocal()
+
+    try:
+        stmt = select(
+            SyncFailure.kind,
+            func.count(),
+            func.count(SyncFailure.dead_lettered_at)
+        ).group_by(SyncFailure.kind)
+        return {
+            kind: {'failing': failing, 'dead_lettered': dead_lettered}
+            for kind, failing, dead_lettered in db.execute(stmt)
+        }
+    finally:
+        db.close()
@@ -1,20 +1,101 @@
 """
 Job to sync event highlights from HLTV
 """
+from sqlalchemy import delete, func, literal_column, not_, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from scrapers.circuit_breaker import CircuitOpenError
 from scrapers.event_highlights import EventHighlightsScraper
 from app.models import Event, EventHighlight
 from app.database import SessionLocal
+from app.overlay_cache import invalidate_event_overlay
+
+# Columns refreshed in place when a clip is already stored
+HIGHLIGHT_SYNC_COLUMNS = (
+    'title',
+    'url',
+    'embed_url',
+    'thumbnail',
+    'video_id',
+    'duration',
+    'platform',
+    'view_count',
+)
+
+
+def highlight_key(h: dict) -> str:
+    """Stable per-event key of a scraped highlight (HLTV ID, else clip ID, else URL)"""
+    return h.get('highlight_id') or h.get('video_id') or h['url']
 
 
-def sync_event_highlights(event_id: str = "8042", event_slug: str = "starladder-budapest-major-2025"):
+def _upsert_event_highlights(db: Session, event: Event, highlights: list):
+    """
+    Reconcile stored highlights with the scraped ones in a single statement
+
+    New clips are inserted, changed clips (e.g. view counts) updated in place,
+    unchanged clips left untouched and clips no longer listed deleted.
+
+    Returns:
+        Row with inserted, updated and removed counts
+    """
+    rows = {}
+    for h in highlights:
+        key = highlight_key(h)
+        if key in rows:
+            continue
+        row = {column: h.get(column) for column in HIGHLIGHT_SYNC_COLUMNS}
+        row['platform'] = h.get('platform', 'twitch')
+        row.update(event_id=event.id, highlight_id=key)
+        rows[key] = row
+
+    removed = (
+        delete(EventHighlight)
+        .where(
+            EventHighlight.event_id == event.id,
+            EventHighlight.highlight_id.notin_(list(rows))
+        )
+        .returning(EventHighlight.id)
+        .cte('removed')
+    )
+
+    insert_stmt = pg_insert(EventHighlight).values(list(rows.values()))
+    upserted = (
+        insert_stmt.on_conflict_do_update(
+            index_elements=[EventHighlight.event_id, EventHighlight.highlight_id],
+            set_={column: insert_stmt.excluded[column] for column in HIGHLIGHT_SYNC_COLUMNS},
+            where=or_(*[
+                getattr(EventHighlight, column).is_distinct_from(insert_stmt.excluded[column])
+                for column in HIGHLIGHT_SYNC_COLUMNS
+            ])
+        )
+        .returning(literal_column('xmax = 0').label('inserted'))
+        .cte('upserted')
+    )
+
+    stmt = select(
+        select(func.count()).select_from(upserted).where(upserted.c.inserted).scalar_subquery().label('inserted'),
+        select(func.count()).select_from(upserted).where(not_(upserted.c.inserted)).scalar_subquery().label('updated'),
+        select(func.count()).select_from(removed).scalar_subquery().label('removed'),
+    )
+    return db.execute(stmt).one()
+
+
+def sync_event_highlights(event_id: str = "8042", event_slug: str = "starladder-budapest-major-2025", raise_errors: bool = False):
     """
     Sync highlights for a specific event
 
     Args:
         event_id: HLTV event ID (default: Budapest Major)
         event_slug: Event URL slug
+        raise_errors: Re-raise scrape/store errors instead of only logging them
+
+    Returns:
+        Dict with highlight counts (unchanged=True if the page hasn't changed),
+        or None if the event doesn't exist or the sync failed
     """
     db = SessionLocal()
+    scraper = None
     try:
         # Find event in database
         event = db.query(Event).filter(Event.external_id == event_id).first()
@@ -24,50 +105,66 @@ def sync_event_highlights(event_id: str = "8042", event_slug: str = "starladder-
 
         # Scrape highlights
         scraper = EventHighlightsScraper()
-        highlights = scraper.scrape(event_id, event_slug)
+        highlights = scraper.scrape(event_id, event_slug, only_if_changed=True)
+
+        if highlights is None:
+            print(f"⏭️  Highlights unchanged for event {event_id}, skipping")
+            return {'unchanged': True}
 
         if not highlights:
             print(f"⚠️  No highlights found for event {event_id}")
-            return
-
-        # Delete existing highlights for this event
-        deleted_count = db.query(EventHighlight).filter(
-            EventHighlight.event_id == event.id
-        ).delete()
-
-        if deleted_count > 0:
-            print(f"🗑️  Deleted {deleted_count} existing highlights")
-
-        # Insert new highlights
-        for h in highlights:
-            highlight = EventHighlight(
-                event_id=event.id,
-                title=h.get('title'),
-                url=h['url'],
-                embed_url=h.get('embed_url'),
-                thumbnail=h.get('thumbnail'),
-                video_id=h.get('video_id'),
-                duration=h.get('duration'),
-                platform=h.get('platform', 'twitch'),
-                view_count=h.get('view_count'),
-                highlight_id=h.get('highlight_id')
-            )
-            db.add(highlight)
+            return {'highlights': 0}
 
+        result = _upsert_event_highlights(db, event, highlights)
         db.commit()
-        print(f"✅ Synced {len(highlights)} highlights for {event.name}")
+        invalidate_event_overlay(event.id)
+
+        print(
+            f"✅ Synced {len(highlights)} highlights for {event.name}: "
+            f"{result.inserted} new, {result.updated} updated, {result.removed} removed"
+        )
         print(f"   Platform: {highlights[0].get('platform') if highlights else 'N/A'}")
         print(f"   Top highlight: {highlights[0].get('title')[:60] if highlights else 'N/A'}...")
 
+        return {
+            'highlights': len(highlights),
+            'inserted': result.inserted,
+            'updated': result.updated,
+            'removed': result.removed
+        }
+
+    except CircuitOpenError:
+        db.rollback()
+        raise
     except Exception as e:
+        if scraper is not None:
+            # Nothing was stored, so the next run must not treat this page as unchanged
+            scraper.fingerprints.forget(scraper.event_url(event_id, event_slug))
         print(f"❌ Error syncing highlights: {e}")
         import traceback
         traceback.print_exc()
         db.rollback()
+        if raise_errors:
+            raise
     finally:
         db.close()
 
 
+def sync_highlights_for_event(event_id: int):
+    """Sync highlights for one event by internal ID (e.g. from a scrape task); errors propagate"""
+    db = SessionLocal()
+    try:
+        event = db.query(Event).filter(Event.id == event_id).first()
+        if not event:
+            print(f"❌ Event {event_id} not found in database")
+            return
+        external_id, slug = event.external_id, event.slug
+    finally:
+        db.close()
+
+    return sync_event_highlights(external_id, slug, raise_errors=True)
+
+
 if __name__ == "__main__":
     # For manual testing
     import sys
@@ -0,0 +1,213 @@
+"""
+Jobs to sync event player and team stats from HLTV
+
+Each stats page is written with one INSERT ... ON CONFLICT per event, keyed
+on (event_id, player_name) in event_player_stats / (event_id, team_name) in
+event_team_map_stats. Ongoing events are
+refreshed on a schedule; once an event has finished, a final pass scrapes
+both pages one last time and marks the event's stats as finalized.
+"""
+import sys
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Event, EventPlayerStat, EventTeamMapStat
+from app.overlay_cache import invalidate_event_overlay
+from jobs.sync_failures import backing_off_event_ids
+from jobs.task_queue import FINALIZE_STATS, PLAYER_STATS, TEAM_STATS, enqueue_task
+from scrapers.base import BaseScraper
+from scrapers.stats_players import StatsPlayersScraper
+from scrapers.stats_teams import StatsTeamsScraper
+
+
+# Columns refreshed from the stats pages on every sync. Team stats from
+# /stats/teams are map-based and go to event_team_map_stats; the standings
+# in event_team_stats are derived from matches only (see jobs.team_stats).
+PLAYER_STAT_COLUMNS = ('team_name', 'rating', 'kd_ratio', 'maps_played')
+TEAM_MAP_STAT_COLUMNS = ('team_logo', 'wins', 'losses', 'win_rate', 'maps_played')
+
+# HLTV settles an event's stats a little after its last match
+FINALIZE_DELAY = timedelta(hours=2)
+# Only recently finished events get a final pass (not the whole archive)
+FINALIZE_WINDOW = timedelta(days=30)
+# Stats pages of finished events don't change; keep them in the response cache for a week
+FINAL_CACHE_TTL = 7 * 24 * 3600
+
+
+def _upsert_stats(db: Session, model, key: str, columns: tuple, event: Event, rows: list) -> dict:
+    """
+    Upsert one event's stats rows in a single statement, skipping unchanged rows
+
+    Returns:
+        Dict with new and updated counts
+    """
+    # The same name twice in one scrape would make ON CONFLICT touch a row twice
+    by_key = {row[key]: row for row in rows if row.get(key)}
+    if not by_key:
+        return {'new': 0, 'updated': 0}
+
+    now = datetime.utcnow()
+    values = [
+        {'event_id': event.id, key: name, 'created_at': now, **{column: row.get(column) for column in columns}}
+        for name, row in by_key.items()
+    ]
+
+    stmt = pg_insert(model).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[model.event_id, getattr(model, key)],
+        set_={column: stmt.excluded[column] for column in columns},
+        where=or_(*[getattr(model, column).is_distinct_from(stmt.excluded[column]) for column in columns])
+    ).returning(
+        # xmax is 0 only for freshly inserted row versions
+        literal_column('xmax = 0').label('inserted')
+    )
+
+    results = db.execute(stmt).all()
+    new = sum(1 for result in results if result.inserted)
+    return {'new': new, 'updated': len(results) - new}
+
+
+def _sync_stats_page(db: Session, scraper: BaseScraper, event: Event, model, key: str, columns: tuple, final: bool) -> dict:
+    """
+    Scrape one stats page for an event and upsert its rows (the caller commits)
+
+    Regular runs skip the write when the page's stats table is unchanged;
+    the final pass always writes.
+
+    Returns:
+        Dict with new and updated counts, or None if the page was unchanged
+    """
+    rows = scraper.scrape(
+        event.external_id,
+        only_if_changed=not final,
+        cache_ttl=FINAL_CACHE_TTL if final else None
+    )
+    if rows is None:
+        return None
+    if final and not rows:
+        # Don't mark the event finalized on a failed fetch; the task is retried
+        raise RuntimeError(f"No {model.__tablename__} rows scraped for finished event {event.external_id}")
+
+    return _upsert_stats(db, model, key, columns, event, rows)
+
+
+def _sync_event_stats(event_id: int, player_stats: bool, team_stats: bool, final: bool = False) -> Optional[dict]:
+    """
+    Sync the requested stats pages for one event (by internal ID) in one transaction
+
+    Returns:
+        Dict of page label -> new and updated counts (None for an unchanged
+        page), or None if the event doesn't exist
+    """
+    db = SessionLocal()
+    pages = []
+    page_urls = []
+    summaries = {}
+
+    try:
+        event = db.execute(select(Event).where(Event.id == event_id)).scalar_one_or_none()
+        if not event:
+            print(f"❌ Event {event_id} not found in database", file=sys.stderr)
+            return
+
+        if player_stats:
+            pages.append(('players', StatsPlayersScraper(), EventPlayerStat, 'player_name', PLAYER_STAT_COLUMNS))
+        if team_stats:
+            pages.append(('teams', StatsTeamsScraper(), EventTeamMapStat, 'team_name', TEAM_MAP_STAT_COLUMNS))
+
+        page_urls = [scraper.stats_url(event.external_id) for _, scraper, *_ in pages]
+
+        print(f"🔄 Syncing {'final ' if final else ''}stats for event: {event.name} (ID: {event.external_id})", file=sys.stderr)
+
+        for label, scraper, model, key, columns in pages:
+            summary = _sync_stats_page(db, scraper, event, model, key, columns, final)
+            summaries[label] = summary
+            if summary is None:
+                print(f"  ⏭️  {label} stats unchanged, skipping", file=sys.stderr)
+            else:
+                print(f"  ✅ {label} stats: {summary['new']} new, {summary['updated']} updated", file=sys.stderr)
+
+        if final:
+            event.stats_finalized_at = datetime.utcnow()
+
+        db.commit()
+        invalidate_event_overlay(event.id)
+        return summaries
+
+    except Exception as e:
+        db.rollback()
+        # Nothing was stored, so the next run must not treat these pages as unchanged
+        for (_, scraper, *_), url in zip(pages, page_urls):
+            scraper.fingerprints.forget(url)
+        print(f"❌ Error syncing stats for event {event_id}: {e}", file=sys.stderr)
+        raise
+    finally:
+        db.close()
+
+
+def sync_event_player_stats(event_id: int) -> Optional[dict]:
+    """Scrape /stats/players for one event (by internal ID) and upsert the rows"""
+    return _sync_event_stats(event_id, player_stats=True, team_stats=False)
+
+
+def sync_event_team_stats(event_id: int) -> Optional[dict]:
+    """Scrape /stats/teams for one event (by internal ID) and upsert the map stats rows"""
+    return _sync_event_stats(event_id, player_stats=False, team_stats=True)
+
+
+def sync_event_stats(event_id: int) -> Optional[dict]:
+    """Scrape both stats pages for one event (by internal ID) and upsert the rows"""
+    return _sync_event_stats(event_id, player_stats=True, team_stats=True)
+
+
+def finalize_event_stats(event_id: int) -> Optional[dict]:
+    """Final player and team stats pass for a finished event; marks its stats finalized"""
+    return _sync_event_stats(event_id, player_stats=True, team_stats=True, final=True)
+
+
+def enqueue_event_stats() -> dict:
+    """
+    Queue stats syncs for ongoing events and final passes for finished ones
+
+    Returns:
+        Dict with ongoing and finalize counts of events queued
+    """
+    db = SessionLocal()
+
+    try:
+        now = datetime.utcnow()
+
+        ongoing_ids = db.execute(
+            select(Event.id).where(Event.status == 'ongoing')
+        ).scalars().all()
+        # Events waiting out a failure backoff are retried by their own tasks
+        for kind in (PLAYER_STATS, TEAM_STATS):
+            backing_off = backing_off_event_ids(db, kind)
+            for event_id in ongoing_ids:
+                if event_id not in backing_off:
+                    enqueue_task(db, kind, event_id, priority=2)
+
+        finished_ids = db.execute(
+            select(Event.id).where(
+                Event.status == 'finished',
+                Event.stats_finalized_at.is_(None),
+                Event.end_date.between(now - FINALIZE_WINDOW, now - FINALIZE_DELAY)
+            )
+        ).scalars().all()
+        backing_off = backing_off_event_ids(db, FINALIZE_STATS)
+        for event_id in finished_ids:
+            if event_id not in backing_off:
+                enqueue_task(db, FINALIZE_STATS, event_id, priority=1)
+
+        db.commit()
+        return {'ongoing': len(ongoing_ids), 'finalize': len(finished_ids)}
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,574 @@
+"""
+Postgres-backed scrape task queue
+
+Scrape work is stored as rows in scrape_tasks. Any number of worker threads
+or processes claim tasks with FOR UPDATE SKIP LOCKED, so they never block
+each other or run the same task twice. A failing task is retried with
+exponential backoff without holding up the rest of the queue; failures are
+recorded in sync_failures (see jobs.sync_failures), and tasks that gave up
+are queued again from there. Due event_results tasks are claimed in
+batches so one worker fetches their results pages concurrently.
+
+Task workers run in `python -m jobs.worker` and in API processes that run
+the scheduler (RUN_TASK_WORKERS overrides that), so API replicas with
+RUN_SCHEDULER=false never scrape. SCRAPE_TASK_WORKERS sets the worker
+threads per process.
+"""
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+import logging
+
+from sqlalchemy import and_, case, delete, func, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import ScrapeTask
+from jobs.circuit_states import CircuitStatePublisher, process_name
+from jobs.sync_failures import clear_failure, due_dead_letters, record_failure, retry_delay
+from scrapers.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+# Task kinds
+EVENT_LIST = 'event_list'
+EVENT_RESULTS = 'event_results'
+PLAYER_STATS = 'player_stats'
+TEAM_STATS = 'team_stats'
+EVENT_STATS = 'event_stats'
+HIGHLIGHTS = 'highlights'
+FINALIZE_STATS = 'finalize_stats'
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+# A retry that was dropped because the same (kind, event) had been queued again
+SUPERSEDED = 'superseded'
+
+# A running task whose lease isn't renewed (its worker died) is claimed again
+TASK_LEASE = timedelta(minutes=15)
+# How often a worker renews the lease of the tasks it is running
+LEASE_HEARTBEAT_SECONDS = 60.0
+# Due tasks of a batched kind claimed together, so their pages are fetched concurrently
+TASK_BATCH_SIZE = 8
+IDLE_POLL_SECONDS = 2.0
+
+
+def _sync_event_list(event_id: Optional[int]):
+    from .sync_event_data import sync_events
+    return sync_events()
+
+
+def _sync_event_results(event_id: Optional[int]):
+    from .sync_event_data import sync_event_matches
+    return sync_event_matches(event_id)
+
+
+def _sync_event_results_batch(event_ids: List[int]):
+    from .sync_event_data import sync_matches_for_events
+    return sync_matches_for_events(event_ids)
+
+
+def _sync_player_stats(event_id: Optional[int]):
+    from .sync_stats import sync_event_player_stats
+    return sync_event_player_stats(event_id)
+
+
+def _sync_team_stats(event_id: Optional[int]):
+    from .sync_stats import sync_event_team_stats
+    return sync_event_team_stats(event_id)
+
+
+def _sync_event_stats(event_id: Optional[int]):
+    from .sync_stats import sync_event_stats
+    return sync_event_stats(event_id)
+
+
+def _finalize_stats(event_id: Optional[int]):
+    from .sync_stats import finalize_event_stats
+    return finalize_event_stats(event_id)
+
+
+def _sync_highlights(event_id: Optional[int]):
+    from .sync_highlights import sync_highlights_for_event
+    return sync_highlights_for_event(event_id)
+
+
+# Task kind -> handler(event_id); event_id is the internal Event.id (None for event_list).
+# A handler's return value (a JSON-serializable summary) is stored as the task result.
+HANDLERS: Dict[str, Callable[[Optional[int]], Optional[dict]]] = {
+    EVENT_LIST: _sync_event_list,
+    EVENT_RESULTS: _sync_event_results,
+    PLAYER_STATS: _sync_player_stats,
+    TEAM_STATS: _sync_team_stats,
+    EVENT_STATS: _sync_event_stats,
+    HIGHLIGHTS: _sync_highlights,
+    FINALIZE_STATS: _finalize_stats,
+}
+
+# Task kind -> handler(event_ids) for kinds whose due tasks are claimed and run
+# together. It returns {event_id: summary or the exception that event failed with}.
+BATCH_HANDLERS: Dict[str, Callable[[List[int]], Dict[int, object]]] = {
+    EVENT_RESULTS: _sync_event_results_batch,
+}
+
+
+def enqueue_task(
+    db: Session,
+    kind: str,
+    event_id: Optional[int] = None,
+    priority: int = 0,
+    not_before: Optional[datetime] = None,
+    expedite: bool = False
+) -> int:
+    """
+    Queue a task (the caller commits)
+
+    If the same (kind, event) is already pending, it keeps a single row with
+    the higher priority and the earlier not_before - unless that row is
+    waiting out a retry backoff, which only expedite (manual triggers) cuts short.
+
+    Returns:
+        ID of the pending task
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown scrape task kind: {kind}")
+
+    now = datetime.utcnow()
+    stmt = pg_insert(ScrapeTask).values(
+        kind=kind,
+        event_id=event_id,
+        priority=priority,
+        not_before=not_before or now,
+        status=PENDING,
+        attempts=0,
+        max_attempts=5,
+        created_at=now,
+        updated_at=now
+    )
+    earliest = func.least(ScrapeTask.not_before, stmt.excluded.not_before)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ScrapeTask.kind, func.coalesce(ScrapeTask.event_id, 0)],
+        index_where=ScrapeTask.status == PENDING,
+        set_={
+            'priority': func.greatest(ScrapeTask.priority, stmt.excluded.priority),
+            'not_before': earliest if expedite else case((ScrapeTask.attempts > 0, ScrapeTask.not_before), else_=earliest),
+            'updated_at': now,
+        }
+    ).returning(ScrapeTask.id)
+    return db.execute(stmt).scalar_one()
+
+
+def submit_task(db: Session, kind: str, event_id: Optional[int] = None, priority: int = 0) -> Tuple[int, bool]:
+    """
+    Queue a task unless the same (kind, event) is already in flight (the caller commits)
+
+    Returns:
+        (task ID, whether an in-flight task was reused)
+    """
+    running = db.execute(
+        select(ScrapeTask.id)
+        .where(
+            ScrapeTask.kind == kind,
+            ScrapeTask.event_id.is_(None) if event_id is None else ScrapeTask.event_id == event_id,
+            ScrapeTask.status == RUNNING,
+            ScrapeTask.updated_at >= datetime.utcnow() - TASK_LEASE
+        )
+        .order_by(ScrapeTask.locked_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if running is not None:
+        return running, True
+
+    pending_before = db.execute(
+        select(func.count()).where(
+            ScrapeTask.kind == kind,
+            ScrapeTask.event_id.is_(None) if event_id is None else ScrapeTask.event_id == event_id,
+            ScrapeTask.status == PENDING
+        )
+    ).scalar_one()
+    # A pending duplicate is reused, and moved up to this priority and to now
+    return enqueue_task(db, kind, event_id, priority=priority, expedite=True), pending_before > 0
+
+
+def tasks_ahead(db: Session, task: ScrapeTask) -> int:
+    """Pending tasks that will be claimed before this pending one"""
+    return db.execute(
+        select(func.count()).where(
+            ScrapeTask.status == PENDING,
+            ScrapeTask.not_before <= datetime.utcnow(),
+            or_(
+                ScrapeTask.priority > task.priority,
+                and_(ScrapeTask.priority == task.priority, ScrapeTask.not_before < task.not_before)
+            )
+        )
+    ).scalar_one()
+
+
+def claim_task(db: Session, worker_id: str) -> Optional[Row]:
+    """
+    Claim the next runnable task and commit the claim
+
+    Tasks are taken by priority, then not_before. Rows locked by other
+    workers are skipped rather than waited on.
+
+    Returns:
+        Row with id, kind, event_id, attempts and max_attempts, or None
+    """
+    now = datetime.utcnow()
+    next_task = (
+        select(ScrapeTask.id)
+        .where(or_(
+            and_(ScrapeTask.status == PENDING, ScrapeTask.not_before <= now),
+            # Worker died mid-task: its lease (updated_at) wasn't renewed
+            and_(ScrapeTask.status == RUNNING, ScrapeTask.updated_at < now - TASK_LEASE)
+        ))
+        .order_by(ScrapeTask.priority.desc(), ScrapeTask.not_before)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(ScrapeTask)
+        .where(ScrapeTask.id == next_task)
+        .values(
+            status=RUNNING,
+            attempts=ScrapeTask.attempts + 1,
+            locked_by=worker_id,
+            locked_at=now,
+            updated_at=now
+        )
+        .returning(ScrapeTask.id, ScrapeTask.kind, ScrapeTask.event_id, ScrapeTask.attempts, ScrapeTask.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+
+    task = db.execute(stmt).one_or_none()
+    db.commit()
+    return task
+
+
+def claim_batch(db: Session, worker_id: str, kind: str, limit: int) -> list:
+    """Claim up to limit more runnable pending tasks of one kind and commit the claim"""
+    if limit <= 0:
+        return []
+
+    now = datetime.utcnow()
+    next_tasks = (
+        select(ScrapeTask.id)
+        .where(ScrapeTask.kind == kind, ScrapeTask.status == PENDING, ScrapeTask.not_before <= now)
+        .order_by(ScrapeTask.priority.desc(), ScrapeTask.not_before)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(ScrapeTask)
+        .where(ScrapeTask.id.in_(next_tasks))
+        .values(
+            status=RUNNING,
+            attempts=ScrapeTask.attempts + 1,
+            locked_by=worker_id,
+            locked_at=now,
+            updated_at=now
+        )
+        .returning(ScrapeTask.id, ScrapeTask.kind, ScrapeTask.event_id, ScrapeTask.attempts, ScrapeTask.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+
+    tasks = db.execute(stmt).all()
+    db.commit()
+    return tasks
+
+
+def _claimed_by(task_id: int, worker_id: Optional[str]):
+    """Filter for a task still held by worker_id (any holder if None)"""
+    if worker_id is None:
+        return ScrapeTask.id == task_id
+    return and_(ScrapeTask.id == task_id, ScrapeTask.status == RUNNING, ScrapeTask.locked_by == worker_id)
+
+
+def complete_task(db: Session, task_id: int, result: Optional[dict] = None, worker_id: Optional[str] = None):
+    """Mark a claimed task as done, storing its handler's summary"""
+    now = datetime.utcnow()
+    db.execute(
+        update(ScrapeTask)
+        .where(_claimed_by(task_id, worker_id))
+        .values(status=DONE, last_error=None, locked_by=None, result=result, finished_at=now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def retry_task(
+    db: Session,
+    task: Row,
+    error: str,
+    delay: Optional[timedelta] = None,
+    count_attempt: bool = True,
+    worker_id: Optional[str] = None
+):
+    """
+    Put a claimed task back in the queue after a failure, or give up on it
+
+    Without an explicit delay the wait doubles with every attempt of the task.
+    """
+    now = datetime.utcnow()
+    attempts = task.attempts if count_attempt else task.attempts - 1
+
+    if count_attempt and attempts >= task.max_attempts:
+        values = dict(status=FAILED, finished_at=now)
+        logger.error(f"[TASKS] Giving up on {task.kind} task {task.id} after {attempts} attempts: {error}")
+    else:
+        if delay is None:
+            delay = retry_delay(attempts)
+        values = dict(status=PENDING, not_before=now + delay)
+
+    stmt = (
+        update(ScrapeTask)
+        .where(_claimed_by(task.id, worker_id))
+        .values(attempts=attempts, last_error=error[:2000], locked_by=None, updated_at=now, **values)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except IntegrityError:
+        # A newer pending task for the same (kind, event) supersedes this one
+        db.rollback()
+        logger.warning(f"[TASKS] Dropping retry of {task.kind} task {task.id}: already queued again")
+        db.execute(
+            update(ScrapeTask)
+            .where(_claimed_by(task.id, worker_id))
+            .values(status=SUPERSEDED, attempts=attempts, last_error=error[:2000], locked_by=None, finished_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+class LeaseHeartbeat:
+    """Renews running tasks' leases while their handler runs, so they aren't claimed twice"""
+
+    def __init__(self, task_ids: List[int], worker_id: str, interval: float = LEASE_HEARTBEAT_SECONDS):
+        self.task_ids = list(task_ids)
+        self.worker_id = worker_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{self.task_ids[0]}", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(ScrapeTask)
+                    .where(
+                        ScrapeTask.id.in_(self.task_ids),
+                        ScrapeTask.status == RUNNING,
+                        ScrapeTask.locked_by == self.worker_id
+                    )
+                    .values(updated_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"[TASKS] Renewing lease of tasks {self.task_ids} failed: {e}")
+            finally:
+                db.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _settle_task(db: Session, task: Row, worker_id: str, result: Optional[dict] = None, error: Optional[Exception] = None):
+    """Complete a claimed task with its result, or schedule its retry after error"""
+    if error is None:
+        clear_failure(db, task.kind, task.event_id)
+        complete_task(db, task.id, result, worker_id=worker_id)
+    elif isinstance(error, CircuitOpenError):
+        # HLTV is down: wait for the breaker instead of burning an attempt
+        retry_task(
+            db, task, str(error),
+            delay=timedelta(seconds=error.retry_after),
+            count_attempt=False,
+            worker_id=worker_id
+        )
+    else:
+        logger.error(f"[TASKS] {task.kind} task {task.id} failed: {error}")
+        # Back off by consecutive failures of this (kind, event), not just this task's attempts
+        failure = record_failure(db, task.kind, task.event_id, error, dead_letter=task.attempts >= task.max_attempts)
+        db.commit()
+        retry_task(db, task, f"{type(error).__name__}: {error}", delay=failure.next_retry_at - datetime.utcnow(), worker_id=worker_id)
+
+
+def run_next_task(worker_id: str) -> bool:
+    """
+    Claim and run one task
+
+    Returns:
+        Whether a task was run (False if the queue had nothing runnable)
+    """
+    db = SessionLocal()
+
+    try:
+        task = claim_task(db, worker_id)
+        if task is None:
+            return False
+
+        if task.kind in BATCH_HANDLERS:
+            tasks = [task] + claim_batch(db, worker_id, task.kind, TASK_BATCH_SIZE - 1)
+            logger.info(f"[TASKS] {worker_id} running {len(tasks)} {task.kind} tasks {[t.id for t in tasks]}")
+            try:
+                with LeaseHeartbeat([t.id for t in tasks], worker_id):
+                    outcomes = BATCH_HANDLERS[task.kind]([t.event_id for t in tasks])
+            except Exception as e:
+                for batch_task in tasks:
+                    _settle_task(db, batch_task, worker_id, error=e)
+            else:
+                for batch_task in tasks:
+                    outcome = outcomes.get(batch_task.event_id)
+                    if isinstance(outcome, Exception):
+                        _settle_task(db, batch_task, worker_id, error=outcome)
+                    else:
+                        _settle_task(db, batch_task, worker_id, result=outcome)
+            return True
+
+        logger.info(f"[TASKS] {worker_id} running {task.kind} task {task.id} (event {task.event_id}, attempt {task.attempts})")
+        try:
+            with LeaseHeartbeat([task.id], worker_id):
+                result = HANDLERS[task.kind](task.event_id)
+        except Exception as e:
+            _settle_task(db, task, worker_id, error=e)
+        else:
+            _settle_task(db, task, worker_id, result=result)
+        return True
+
+    finally:
+        db.close()
+
+
+def requeue_dead_letters() -> int:
+    """
+    Queue a new task for every dead-lettered sync failure whose retry is due
+
+    Returns:
+        Number of tasks queued
+    """
+    db = SessionLocal()
+
+    try:
+        failures = due_dead_letters(db)
+        for failure in failures:
+            enqueue_task(db, failure.kind, failure.event_id, priority=1)
+            failure.dead_lettered_at = None
+        db.commit()
+        return len(failures)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def prune_tasks(older_than: timedelta = timedelta(days=7)) -> int:
+    """Delete finished tasks older than the given age; returns rows deleted"""
+    db = SessionLocal()
+
+    try:
+        result = db.execute(
+            delete(ScrapeTask).where(
+                ScrapeTask.status.in_([DONE, FAILED, SUPERSEDED]),
+                ScrapeTask.updated_at < datetime.utcnow() - older_than
+            )
+        )
+        db.commit()
+        return result.rowcount
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def queue_summary() -> Dict[str, Dict[str, int]]:
+    """Task counts by kind and status, for status endpoints"""
+    db = SessionLocal()
+
+    try:
+        stmt = select(ScrapeTask.kind, ScrapeTask.status, func.count()).group_by(ScrapeTask.kind, ScrapeTask.status)
+        summary: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in db.execute(stmt):
+            summary.setdefault(kind, {})[status] = count
+        return summary
+    finally:
+        db.close()
+
+
+class TaskWorkers:
+    """Worker threads that keep claiming and running scrape tasks"""
+
+    def __init__(self, threads: int):
+        self.threads = max(0, threads)
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        # This process's breakers are only visible to other processes through the database
+        self._circuit_states = CircuitStatePublisher()
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                if run_next_task(worker_id):
+                    continue
+            except Exception as e:
+                logger.error(f"[TASKS] {worker_id} error: {e}", exc_info=True)
+            self._stop.wait(IDLE_POLL_SECONDS)
+
+    def start(self):
+        prefix = process_name()
+        for n in range(self.threads):
+            worker = threading.Thread(target=self._run, args=(f"{prefix}:{n}",), name=f"scrape-task-{n}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        self._circuit_states.start()
+        logger.info(f"[TASKS] Started {self.threads} scrape task workers")
+
+    def stop(self, timeout: float = 30.0):
+        """Stop claiming new tasks and wait for running ones to finish"""
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers.clear()
+        self._circuit_states.stop()
+
+
+_workers: Optional[TaskWorkers] = None
+_workers_lock = threading.Lock()
+
+
+def start_task_workers() -> TaskWorkers:
+    """Start this process's task worker threads (SCRAPE_TASK_WORKERS, default 2)"""
+    global _workers
+    with _workers_lock:
+        if _workers is None:
+            _workers = TaskWorkers(get_settings().scrape_task_workers)
+            _workers.start()
+        return _workers
+
+
+def stop_task_workers():
+    """Stop the task worker threads (used on shutdown)"""
+    global _workers
+    with _workers_lock:
+        if _workers is not None:
+            _workers.stop()
+            _workers = None
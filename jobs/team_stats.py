@@ -0,0 +1,206 @@
+"""
+Team standings for an event, aggregated from its finished matches
+"""
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Integer, Numeric, case, cast, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg, insert as pg_insert
+
+from app.models import EventTeamStat, Match
+
+
+TEAM_STAT_COLUMNS = ('team_logo', 'wins', 'losses', 'win_rate', 'maps_played')
+
+
+def _finished_matches(event_id: int):
+    """Finished matches of the event that have a final score"""
+    return select(
+        Match.id,
+        Match.team1_name,
+        Match.team1_logo,
+        Match.team1_score,
+        Match.team2_name,
+        Match.team2_logo,
+        Match.team2_score
+    ).where(
+        Match.event_id == event_id,
+        Match.status == 'finished',
+        Match.team1_score.isnot(None),
+        Match.team2_score.isnot(None)
+    ).cte('finished')
+
+
+def _team_perspectives(finished):
+    """One row per (match, team) with the team's result in that match"""
+    def perspective(team, team_logo, score, opponent, opponent_score):
+        return select(
+            finished.c.id.label('match_id'),
+            team.label('team_name'),
+            team_logo.label('logo'),
+            case((score > opponent_score, 1), else_=0).label('won'),
+            case((score < opponent_score, 1), else_=0).label('lost')
+        ).where(
+            # Matches without both team names can't be attributed (TBD slots)
+            func.coalesce(team, '') != '',
+            func.coalesce(opponent, '') != ''
+        )
+
+    c = finished.c
+    return union_all(
+        perspective(c.team1_name, c.team1_logo, c.team1_score, c.team2_name, c.team2_score),
+        perspective(c.team2_name, c.team2_logo, c.team2_score, c.team1_name, c.team1_score),
+    ).subquery('perspectives')
+
+
+def recalculate_event_team_stats(db: Session, event_id: int) -> dict:
+    """
+    Rebuild an event's team standings from its finished matches
+
+    Wins, losses, maps played and the latest known logo are aggregated in
+    the database and upserted into event_team_stats with one statement;
+    rows whose values didn't change are left untouched. The caller commits.
+
+    Returns:
+        Dict with teams (standings rows aggregated), updated (rows inserted
+        or changed) and matches (finished matches considered)
+    """
+    finished = _finished_matches(event_id)
+    p = _team_perspectives(finished)
+
+    wins = func.sum(p.c.won)
+    losses = func.sum(p.c.lost)
+    aggregated = select(
+        literal(event_id, Integer).label('event_id'),
+        p.c.team_name,
+        # Logo from the team's most recent match that had one
+        array_agg(aggregate_order_by(p.c.logo, p.c.match_id.desc())).filter(p.c.logo.isnot(None))[1].label('team_logo'),
+        cast(wins, Integer).label('wins'),
+        cast(losses, Integer).label('losses'),
+        func.coalesce(func.round(cast(wins * 100, Numeric) / func.nullif(wins + losses, 0), 2), 0).label('win_rate'),
+        func.count().label('maps_played'),
+        literal(datetime.utcnow(), DateTime).label('created_at')
+    ).group_by(p.c.team_name).cte('aggregated')
+
+    stmt = pg_insert(EventTeamStat).from_select(
+        ['event_id', 'team_name', *TEAM_STAT_COLUMNS, 'created_at'],
+        select(aggregated)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventTeamStat.event_id, EventTeamStat.team_name],
+        set_={column: stmt.excluded[column] for column in TEAM_STAT_COLUMNS},
+        where=or_(*[getattr(EventTeamStat, column).is_distinct_from(stmt.excluded[column]) for column in TEAM_STAT_COLUMNS])
+    ).returning(EventTeamStat.id).cte('upserted')
+
+    counts = select(
+        select(func.count()).select_from(aggregated).scalar_subquery().label('teams'),
+        select(func.count()).select_from(stmt).scalar_subquery().label('updated'),
+        select(func.count()).select_from(finished).scalar_subquery().label('matches')
+    )
+
+    result = db.execute(counts).one()
+    return {'teams': result.teams, 'updated': result.updated, 'matches': result.matches}
+
+
+def match_team_results(match: dict) -> dict:
+    """
+    What a match contributes to the standings, keyed by team name
+
+    Only finished matches with a score and both team names count.
+
+    Returns:
+        Dict of team name -> (wins, losses, maps_played)
+    """
+    team1, team2 = match.get('team1_name'), match.get('team2_name')
+    score1, score2 = match.get('team1_score'), match.get('team2_score')
+    if match.get('status') != 'finished' or score1 is None or score2 is None or not team1 or not team2:
+        return {}
+
+    return {
+        team1: (int(score1 > score2), int(score1 < score2), 1),
+        team2: (int(score2 > score1), int(score2 < score1), 1),
+    }
+
+
+def team_stat_deltas(transitions: list) -> dict:
+    """
+    Net standings change from a batch of match updates
+
+    Args:
+        transitions: (old, new) match dicts; old is None for new matches
+
+    Returns:
+        Dict of team name -> {'wins', 'losses', 'maps_played', 'team_logo'}
+        for every team whose numbers changed
+    """
+    deltas = {}
+    for old, new in transitions:
+        for sign, match in ((-1, old), (1, new)):
+            if match is None:
+                continue
+            for team, results in match_team_results(match).items():
+                delta = deltas.setdefault(team, {'wins': 0, 'losses': 0, 'maps_played': 0, 'team_logo': None})
+                for column, value in zip(('wins', 'losses', 'maps_played'), results):
+                    delta[column] += sign * value
+
+        # Teams that just picked up a result also pick up that match's logo
+        for team in match_team_results(new):
+            logo = new['team1_logo'] if team == new.get('team1_name') else new['team2_logo']
+            deltas[team]['team_logo'] = logo or deltas[team]['team_logo']
+
+    return {
+        team: delta for team, delta in deltas.items()
+        if delta['wins'] or delta['losses'] or delta['maps_played']
+    }
+
+
+def apply_team_stat_deltas(db: Session, event_id: int, deltas: dict) -> int:
+    """
+    Add standings deltas to event_team_stats in one upsert (the caller commits)
+
+    If the event has no standings yet they are rebuilt from all of its
+    finished matches instead, so earlier results are not missed.
+
+    Returns:
+        Number of team rows written
+    """
+    if not deltas:
+        return 0
+
+    has_standings = db.execute(
+        select(EventTeamStat.id).where(EventTeamStat.event_id == event_id).limit(1)
+    ).first() is not None
+    if not has_standings:
+        return recalculate_event_team_stats(db, event_id)['updated']
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            'event_id': event_id,
+            'team_name': team,
+            'team_logo': delta['team_logo'],
+            'wins': delta['wins'],
+            'losses': delta['losses'],
+            'maps_played': delta['maps_played'],
+            # Only used when the team has no row yet
+            'win_rate': round(delta['wins'] / (delta['wins'] + delta['losses']) * 100, 2) if delta['wins'] + delta['losses'] > 0 else 0,
+            'created_at': now,
+        }
+        for team, delta in deltas.items()
+    ]
+
+    stmt = pg_insert(EventTeamStat).values(rows)
+    wins = func.coalesce(EventTeamStat.wins, 0) + stmt.excluded.wins
+    losses = func.coalesce(EventTeamStat.losses, 0) + stmt.excluded.losses
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventTeamStat.event_id, EventTeamStat.team_name],
+        set_={
+            'wins': wins,
+            'losses': losses,
+            'maps_played': func.coalesce(EventTeamStat.maps_played, 0) + stmt.excluded.maps_played,
+            'win_rate': func.coalesce(func.round(cast(wins * 100, Numeric) / func.nullif(wins + losses, 0), 2), 0),
+            'team_logo': func.coalesce(stmt.excluded.team_logo, EventTeamStat.team_logo),
+        }
+    )
+
+    db.execute(stmt)
+    return len(rows)
@@ -0,0 +1,58 @@
+"""
+Standalone scheduler and scrape task worker
+
+Runs the scraping schedules and the scrape task workers without serving
+HTTP, so scraping stays in its own processes with their own connection
+pools and parse workers while API replicas scale independently:
+
+    python -m jobs.worker
+
+Only the scheduler leader queues work, but every worker process runs
+SCRAPE_TASK_WORKERS task threads, so more workers means more throughput.
+API processes with RUN_SCHEDULER=false don't run task workers unless
+RUN_TASK_WORKERS=true.
+"""
+import logging
+import signal
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Start the scheduler and block until SIGINT/SIGTERM"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from .scheduler import shutdown_scheduler, start_scheduler
+    from .task_queue import start_task_workers, stop_task_workers
+    from scrapers.parse_pool import shutdown_parse_pool
+    from scrapers.session import close_session_pool
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"🛑 Received {signal.Signals(signum).name}, stopping worker...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    logger.info("🚀 Starting scheduler worker...")
+    start_scheduler()
+    start_task_workers()
+
+    try:
+        stop.wait()
+    finally:
+        stop_task_workers()
+        shutdown_scheduler()
+        close_session_pool()
+        shutdown_parse_pool()
+        logger.info("👋 Scheduler worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.database import get_db
-from app.models import Event, Match, EventPlayerStat, EventTeamStat, EventHighlight
-from collections import defaultdict
+from app.models import Event, Match, EventPlayerStat, EventTeamStat, EventTeamMapStat, EventHighlight
+from app.overlay_cache import get_overlay_cache, invalidate_event_overlay
+from jobs.team_stats import recalculate_event_team_stats
 from datetime import datetime
 from pydantic import BaseModel
+import json
 import re
 
 router = APIRouter(tags=["events"])
@@ -85,22 +87,8 @@ def get_event(slug: str, db: Session = Depends(get_db)):
         "location": event.location
     }
 
-@router.get("/events/{slug}/overlay")
-def get_event_overlay(
-    slug: str,
-    matches_limit: int = 100,
-    players_limit: int = 20,
-    teams_limit: int = 20,
-    db: Session = Depends(get_db)
-):
-    """
-    Get complete event data: event + matches + top players + top teams
-
-    Query params:
-    - matches_limit: Max number of matches to return (default: 100)
-    - players_limit: Max number of players to return (default: 20)
-    - teams_limit: Max number of teams to return (default: 20)
-    """
+def _load_event_overlay(db: Session, slug: str, max_matches: int, max_players: int, max_teams: int) -> dict:
+    """Query the overlay payload of an event"""
 
     # Get event
     stmt = select(Event).where(Event.slug == slug)
@@ -109,8 +97,7 @@ def get_event_overlay(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Get matches (limit configurable, max 500)
-    max_matches = min(matches_limit, 500)
+    # Get matches
     matches_stmt = (
         select(Match)
         .where(Match.event_id == event.id)
@@ -119,8 +106,7 @@ def get_event_overlay(
     )
     matches = db.execute(matches_stmt).scalars().all()
 
-    # Get player stats (limit configurable, max 100)
-    max_players = min(players_limit, 100)
+    # Get player stats
     players_stmt = (
         select(EventPlayerStat)
         .where(EventPlayerStat.event_id == event.id)
@@ -129,8 +115,7 @@ def get_event_overlay(
     )
     player_stats = db.execute(players_stmt).scalars().all()
 
-    # Get team stats (limit configurable, max 50)
-    max_teams = min(teams_limit, 50)
+    # Get team stats
     teams_stmt = (
         select(EventTeamStat)
         .where(EventTeamStat.event_id == event.id)
@@ -139,6 +124,15 @@ def get_event_overlay(
     )
     team_stats = db.execute(teams_stmt).scalars().all()
 
+    # Get map-based team stats scraped from HLTV /stats/teams
+    team_map_stats_stmt = (
+        select(EventTeamMapStat)
+        .where(EventTeamMapStat.event_id == event.id)
+        .order_by(EventTeamMapStat.win_rate.desc().nullslast())
+        .limit(max_teams)
+    )
+    team_map_stats = db.execute(team_map_stats_stmt).scalars().all()
+
     # Get highlights (top 12 by views)
     highlights_stmt = (
         select(EventHighlight)
@@ -198,6 +192,17 @@ def get_event_overlay(
             }
             for team in team_stats
         ],
+        "topTeamMapStats": [
+            {
+                "team_name": team.team_name,
+                "team_logo": team.team_logo,
+                "maps_won": team.wins,
+                "maps_lost": team.losses,
+                "win_rate": float(team.win_rate) if team.win_rate else None,
+                "maps_played": team.maps_played
+            }
+            for team in team_map_stats
+        ],
         "highlights": [
             {
                 "title": h.title,
@@ -213,6 +218,38 @@ def get_event_overlay(
         ]
     }
 
+@router.get("/events/{slug}/overlay")
+def get_event_overlay(
+    slug: str,
+    matches_limit: int = 100,
+    players_limit: int = 20,
+    teams_limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """
+    Get complete event data: event + matches + top players + top teams
+    (match standings in topTeams, HLTV map stats in topTeamMapStats)
+
+    Served from the in-process overlay cache (see app.overlay_cache) until
+    the event changes or the entry expires.
+
+    Query params:
+    - matches_limit: Max number of matches to return (default: 100, max 500)
+    - players_limit: Max number of players to return (default: 20, max 100)
+    - teams_limit: Max number of teams to return in topTeams and topTeamMapStats (default: 20, max 50)
+    """
+    max_matches = min(matches_limit, 500)
+    max_players = min(players_limit, 100)
+    max_teams = min(teams_limit, 50)
+
+    def load():
+        payload = _load_event_overlay(db, slug, max_matches, max_players, max_teams)
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return payload["event"]["id"], slug, body
+
+    body = get_overlay_cache().get_or_load((slug, max_matches, max_players, max_teams), load)
+    return Response(content=body, media_type="application/json")
+
 @router.post("/events/{slug}/calculate-stats")
 def calculate_event_stats(slug: str, db: Session = Depends(get_db)):
     """Calculate team statistics from match results"""
@@ -224,84 +261,15 @@ def calculate_event_stats(slug: str, db: Session = Depends(get_db)):
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Get all finished matches
-    matches_stmt = select(Match).where(
-        Match.event_id == event.id,
-        Match.status == 'finished',
-        Match.team1_score.isnot(None),
-        Match.team2_score.isnot(None)
-    )
-    matches = db.execute(matches_stmt).scalars().all()
-
-    # Aggregate stats by team
-    team_stats = defaultdict(lambda: {
-        'wins': 0,
-        'losses': 0,
-        'maps_played': 0,
-        'logo': None
-    })
-
-    for match in matches:
-        team1 = match.team1_name
-        team2 = match.team2_name
-
-        if not team1 or not team2:
-            continue
-
-        # Update maps played
-        team_stats[team1]['maps_played'] += 1
-        team_stats[team2]['maps_played'] += 1
-
-        # Update logos
-        if match.team1_logo:
-            team_stats[team1]['logo'] = match.team1_logo
-        if match.team2_logo:
-            team_stats[team2]['logo'] = match.team2_logo
-
-        # Determine winner
-        if match.team1_score > match.team2_score:
-            team_stats[team1]['wins'] += 1
-            team_stats[team2]['losses'] += 1
-        elif match.team2_score > match.team1_score:
-            team_stats[team2]['wins'] += 1
-            team_stats[team1]['losses'] += 1
-
-    # Save to database
-    for team_name, stats in team_stats.items():
-        total_games = stats['wins'] + stats['losses']
-        win_rate = (stats['wins'] / total_games * 100) if total_games > 0 else 0
-
-        # Check if exists
-        existing = db.query(EventTeamStat).filter(
-            EventTeamStat.event_id == event.id,
-            EventTeamStat.team_name == team_name
-        ).first()
-
-        if existing:
-            existing.wins = stats['wins']
-            existing.losses = stats['losses']
-            existing.win_rate = round(win_rate, 2)
-            existing.maps_played = stats['maps_played']
-            existing.team_logo = stats['logo']
-        else:
-            team_stat = EventTeamStat(
-                event_id=event.id,
-                team_name=team_name,
-                team_logo=stats['logo'],
-                wins=stats['wins'],
-                losses=stats['losses'],
-                win_rate=round(win_rate, 2),
-                maps_played=stats['maps_played']
-            )
-            db.add(team_stat)
-
+    summary = recalculate_event_team_stats(db, event.id)
     db.commit()
+    invalidate_event_overlay(event.id)
 
     return {
         "status": "success",
-        "message": f"Calculated stats for {len(team_stats)} teams",
-        "teams": len(team_stats),
-        "matches": len(matches)
+        "message": f"Calculated stats for {summary['teams']} teams",
+        "teams": summary['teams'],
+        "matches": summary['matches']
     }
 
 
@@ -329,6 +297,7 @@ def update_event_status(slug: str, request: UpdateEventStatusRequest, db: Sessio
     event.updated_at = datetime.utcnow()
 
     db.commit()
+    invalidate_event_overlay(event.id)
 
     return {
         "status": "success",
@@ -381,6 +350,7 @@ def update_event_details(slug: str, request: UpdateEventDetailsRequest, db: Sess
     event.updated_at = datetime.utcnow()
 
     db.commit()
+    invalidate_event_overlay(event.id)
 
     return {
         "status": "success",
@@ -438,6 +408,7 @@ def upgrade_event_logos(slug: str, db: Session = Depends(get_db)):
             updated_teams += 1
 
     db.commit()
+    invalidate_event_overlay(event.id)
 
     return {
         "status": "success",
@@ -5,6 +5,8 @@ Needed to bypass CORS and Cloudflare protection
 from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from curl_cffi import requests
+from scrapers.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from scrapers.rate_limit import get_rate_limiter
 import io
 
 router = APIRouter()
@@ -24,7 +26,19 @@ async def proxy_team_logo(url: str):
     if 'hltv.org' not in url:
         raise HTTPException(status_code=400, detail="Invalid URL - must be from hltv.org")
     
+    rate_limiter = get_rate_limiter()
+    # The image CDN has its own circuit, separate from page scraping
+    circuit_breaker = get_circuit_breaker(url)
+
+    try:
+        circuit_breaker.before_request()
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     try:
+        # Logos on the image CDN have their own fast bucket, apart from page scraping
+        await rate_limiter.acquire_async(url)
+
         # Use curl_cffi with browser impersonation to bypass Cloudflare
         response = requests.get(
             url,
@@ -32,6 +46,9 @@ async def proxy_team_logo(url: str):
             timeout=10
         )
 
+        circuit_breaker.record_response(response.status_code)
+        rate_limiter.on_response(url, response.status_code, response.headers.get('Retry-After'))
+
         if response.status_code != 200:
             raise HTTPException(
                 status_code=response.status_code,
@@ -51,5 +68,8 @@ async def proxy_team_logo(url: str):
             }
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
+        circuit_breaker.record_failure()
         raise HTTPException(status_code=500, detail=f"Error fetching image: {str(e)}")
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from app.database import get_db
+from app.models import Event, ScrapeTask
+from jobs.task_queue import (
+    DONE,
+    EVENT_LIST,
+    EVENT_RESULTS,
+    EVENT_STATS,
+    FAILED,
+    FINALIZE_STATS,
+    HIGHLIGHTS,
+    PENDING,
+    SUPERSEDED,
+    submit_task,
+    tasks_ahead,
+)
+from datetime import datetime
+
+router = APIRouter(prefix="/trigger", tags=["trigger"])
+
+# Manual triggers are claimed before any scheduled work
+TRIGGER_PRIORITY = 20
+
+
+def _event_id(db: Session, external_id: str) -> int:
+    """Internal ID of an event by HLTV ID"""
+    event_id = db.execute(
+        select(Event.id).where(Event.external_id == external_id)
+    ).scalar_one_or_none()
+
+    if event_id is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    return event_id
+
+
+def _trigger(db: Session, kind: str, event_id: int | None = None) -> dict:
+    """Queue a scrape task (or reuse an identical one in flight) and return its job ID"""
+    task_id, deduplicated = submit_task(db, kind, event_id, priority=TRIGGER_PRIORITY)
+    db.commit()
+
+    return {
+        "status": "queued",
+        "job_id": task_id,
+        "kind": kind,
+        "deduplicated": deduplicated,
+        "status_url": f"/trigger/{task_id}"
+    }
+
+
+@router.post("/sync-events")
+def trigger_sync_events(db: Session = Depends(get_db)):
+    """Queue a sync of the HLTV events list"""
+    return _trigger(db, EVENT_LIST)
+
+
+@router.post("/sync-matches")
+def trigger_sync_matches(eventId: str, db: Session = Depends(get_db)):
+    """Queue a match results sync for an event (by HLTV ID)"""
+    return _trigger(db, EVENT_RESULTS, _event_id(db, eventId))
+
+
+@router.post("/sync-stats")
+def trigger_sync_stats(eventId: str, final: bool = False, db: Session = Depends(get_db)):
+    """Queue a player and team stats sync for an event (final=true also marks its stats finalized)"""
+    return _trigger(db, FINALIZE_STATS if final else EVENT_STATS, _event_id(db, eventId))
+
+
+@router.post("/sync-highlights")
+def trigger_sync_highlights(eventId: str = "8042", db: Session = Depends(get_db)):
+    """Queue a highlights sync for an event (by HLTV ID)"""
+    return _trigger(db, HIGHLIGHTS, _event_id(db, eventId))
+
+
+@router.get("/{job_id}")
+def get_trigger_status(job_id: int, db: Session = Depends(get_db)):
+    """Progress, timings and result of a triggered job"""
+
+    task = db.get(ScrapeTask, job_id)
+
+    if not task:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    now = datetime.utcnow()
+    # A pending task that has already been tried is waiting for its retry
+    started_at = task.locked_at if task.attempts and task.status != PENDING else None
+    ended_at = task.finished_at if task.status in (DONE, FAILED, SUPERSEDED) else now
+
+    return {
+        "job_id": task.id,
+        "kind": task.kind,
+        "event_id": task.event_id,
+        "status": task.status,  # pending, running, done, failed, superseded
+        "attempts": task.attempts,
+        "max_attempts": task.max_attempts,
+        "queued_ahead": tasks_ahead(db, task) if task.status == PENDING else None,
+        "next_attempt_at": task.not_before.isoformat() if task.status == PENDING else None,
+        "created_at": task.created_at.isoformat() if task.created_at else None,
+        "started_at": started_at.isoformat() if started_at else None,
+        "finished_at": task.finished_at.isoformat() if task.finished_at else None,
+        "wait_seconds": round(((started_at or now) - task.created_at).total_seconds(), 1) if task.created_at else None,
+        "run_seconds": round((ended_at - started_at).total_seconds(), 1) if started_at and ended_at else None,
+        "result": task.result,
+        "error": task.last_error
+    }
@@ -0,0 +1,175 @@
+"""
+Asyncio fetch engine for scraping many HLTV pages concurrently
+
+Uses curl_cffi's AsyncSession with the same browser impersonation as
+BaseScraper, and caps the number of in-flight requests per host. Used as
+`async with AsyncFetchEngine() as engine`, one session (and its kept-alive
+connections) serves the batch and every follow-up page fetched during it.
+"""
+from contextlib import asynccontextmanager
+from curl_cffi.requests import AsyncSession
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import sys
+
+from app.config import get_scraper_settings
+from .base import MAX_THROTTLE_WAIT
+from .cache import ResponseCache, get_response_cache
+from .circuit_breaker import CircuitOpenError, get_circuit_breakers
+from .rate_limit import get_rate_limiter
+from .session import DEFAULT_HEADERS, IMPERSONATE
+
+
+class AsyncFetchEngine:
+    """Fetch a batch of URLs in parallel with a bounded per-host concurrency"""
+
+    def __init__(
+        self,
+        per_host_limit: Optional[int] = None,
+        retry: int = 3,
+        delay: float = 2.0,
+        timeout: int = 30,
+        cache: Optional[ResponseCache] = None
+    ):
+        if per_host_limit is None:
+            per_host_limit = get_scraper_settings().scraper_per_host_concurrency
+        self.per_host_limit = max(1, per_host_limit)
+        self.retry = retry
+        self.delay = delay
+        self.timeout = timeout
+        self.cache = cache if cache is not None else get_response_cache()
+        self.rate_limiter = get_rate_limiter()
+        self.circuit_breakers = get_circuit_breakers()
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        # Open while the engine is used as an async context manager
+        self._shared_session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> "AsyncFetchEngine":
+        self._shared_session = self._session()
+        return self
+
+    async def __aexit__(self, *exc):
+        session, self._shared_session = self._shared_session, None
+        await session.close()
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    def _session(self) -> AsyncSession:
+        return AsyncSession(
+            impersonate=IMPERSONATE,
+            headers=DEFAULT_HEADERS,
+            max_clients=self.per_host_limit * 2
+        )
+
+    @asynccontextmanager
+    async def _use_session(self) -> AsyncIterator[AsyncSession]:
+        """The engine's shared session if open, else a session for this call only"""
+        if self._shared_session is not None:
+            yield self._shared_session
+            return
+        async with self._session() as session:
+            yield session
+
+    async def fetch_url(self, url: str) -> Optional[str]:
+        """Fetch a single URL outside of a batch (e.g. a follow-up page)"""
+        async with self._use_session() as session:
+            return await self.fetch(session, url)
+
+    async def fetch(self, session: AsyncSession, url: str) -> Optional[str]:
+        """
+        Fetch a single URL through the shared rate limiter, retrying with backoff
+
+        Returns:
+            Response text or None if all attempts failed
+
+        Raises:
+            CircuitOpenError: HLTV is considered down and no request was made
+        """
+        if self.cache.enabled:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+            if self.cache.replay_only:
+                print(f"❌ Not in cache (replay mode): {url}", file=sys.stderr)
+                return None
+
+        circuit_breaker = self.circuit_breakers.for_url(url)
+        throttled = False
+        for attempt in range(self.retry):
+            # After a 429/503 the rate limiter already holds the host for Retry-After
+            if attempt > 0 and not throttled:
+                wait_time = self.delay * (2 ** attempt)
+                print(f"⏳ Waiting {wait_time}s before retrying {url}...", file=sys.stderr)
+                await asyncio.sleep(wait_time)
+
+            # Fail fast (without further retries or sleeps) while HLTV is down
+            is_probe = circuit_breaker.before_request()
+
+            try:
+                await self.rate_limiter.acquire_async(url)
+                async with self._host_limit(url):
+                    print(f"Fetching: {url} (attempt {attempt + 1}/{self.retry})", file=sys.stderr)
+                    response = await session.get(url, timeout=self.timeout, allow_redirects=True)
+
+                circuit_breaker.record_response(response.status_code)
+                pause = self.rate_limiter.on_response(url, response.status_code, response.headers.get('Retry-After'))
+                throttled = pause is not None
+
+                if response.status_code == 200:
+                    print(f"✅ Success: {url}", file=sys.stderr)
+                    self.cache.set(url, response.text)
+                    return response.text
+
+                print(f"❌ HTTP {response.status_code}: {url}", file=sys.stderr)
+
+                if throttled and pause > MAX_THROTTLE_WAIT:
+                    print(f"⏭️  Throttled for {pause:.0f}s, giving up on {url} for now", file=sys.stderr)
+                    return None
+
+            except asyncio.CancelledError:
+                # A cancelled probe has no outcome; don't leave the circuit stuck half-open
+                if is_probe:
+                    circuit_breaker.release_probe()
+                raise
+            except Exception as e:
+                throttled = False
+                circuit_breaker.record_failure()
+                print(f"❌ Error: {url}: {e}", file=sys.stderr)
+
+        return None
+
+    async def fetch_many(
+        self,
+        urls: Iterable[str]
+    ) -> AsyncIterator[Tuple[str, Optional[str], Optional[CircuitOpenError]]]:
+        """
+        Fetch all URLs concurrently, yielding (url, text, circuit_error) as each one completes
+
+        Failed URLs are yielded with text None so callers can account for them;
+        circuit_error is set when the URL was skipped because its host's
+        circuit is open. A batch is never cut short by an open circuit, so a
+        half-open probe among its requests always gets to report back.
+        """
+        urls = list(urls)
+        if not urls:
+            return
+
+        async def fetch_one(session: AsyncSession, url: str) -> Tuple[str, Optional[str], Optional[CircuitOpenError]]:
+            try:
+                return url, await self.fetch(session, url), None
+            except CircuitOpenError as e:
+                return url, None, e
+
+        async with self._use_session() as session:
+            tasks = [asyncio.ensure_future(fetch_one(session, url)) for url in urls]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
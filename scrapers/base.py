@@ -1,63 +1,168 @@
 """
 Base scraper class using curl_cffi to bypass Cloudflare
 """
-from curl_cffi import requests
-from bs4 import BeautifulSoup
-from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Optional, Tuple
+import asyncio
 import time
 import sys
 
+from .budget import RequestBudget
+from .cache import get_response_cache
+from .circuit_breaker import get_circuit_breakers
+from .fingerprint import get_fingerprint_store, region_digest
+from .parse_pool import run_parse
+from .rate_limit import get_rate_limiter
+from .session import get_session_pool
+
+# Longest Retry-After a fetch will wait out before giving up on the URL
+MAX_THROTTLE_WAIT = 60.0
+
 
 class BaseScraper:
     """Base class for HLTV scrapers using curl_cffi"""
 
+    # Region of the page the scraper needs - only this part is parsed (None = whole page)
+    parse_only: Optional[SoupStrainer] = None
+
     def __init__(self):
         self.base_url = "https://www.hltv.org"
+        self.session_pool = get_session_pool()
+        self.fingerprints = get_fingerprint_store()
+        # Pluggable: set to another ResponseCache (or None) to change caching per scraper
+        self.cache = get_response_cache()
+        self.rate_limiter = get_rate_limiter()
+        self.circuit_breakers = get_circuit_breakers()
+        # Optional cap on network requests (e.g. shared by all scrapers of a backfill run)
+        self.request_budget: Optional[RequestBudget] = None
+
+    def find_region(self, soup) -> list:
+        """Elements of the page the scraper parses and fingerprints"""
+        return [soup]
+
+    def parse_region(self, region: list, *args) -> list:
+        """
+        Turn the page region into row dicts
+
+        Scrapers override this with their own row format. The default keeps
+        each region element as its HTML ({'html': ...}), which can be sent
+        back from the parse pool, so scrapers without rows of their own
+        (and debug scripts) can still parse() a page.
+        """
+        return [{'html': str(element)} for element in region]
+
+    def parse_page(self, html: str, *args, previous_digest: Optional[str] = None) -> Tuple[str, Optional[list]]:
+        """
+        Parse raw HTML into rows (runs inside a parse pool worker)
+
+        Returns:
+            (region digest, rows) - rows is None if the region matches previous_digest
+        """
+        region = self.find_region(self.make_soup(html))
+        digest = region_digest(region)
+        if digest == previous_digest:
+            return digest, None
+        return digest, self.parse_region(region, *args)
+
+    def parse(self, html: str, *args, url: Optional[str] = None) -> Optional[list]:
+        """
+        Parse a fetched page in the parse pool
+
+        If url is given, returns None when the page region is identical to
+        the last one parsed for that url (the parse is skipped).
+        """
+        previous_digest = self.fingerprints.get(url) if url else None
+        digest, rows = run_parse(type(self), html, args, previous_digest)
+
+        if url:
+            self.fingerprints.remember(url, digest)
+            if rows is None:
+                print(f"⏭️  Unchanged since last run: {url}", file=sys.stderr)
+        return rows
+
+    async def parse_async(self, html: str, *args, url: Optional[str] = None) -> Optional[list]:
+        """parse() without blocking the event loop while the worker runs"""
+        return await asyncio.to_thread(self.parse, html, *args, url=url)
+
+    def make_soup(self, html: str, full_page: bool = False) -> BeautifulSoup:
+        """
+        Parse raw HTML with lxml, keeping only the scraper's parse_only region
 
-    def fetch(self, url: str, retry: int = 3, delay: float = 2.0) -> Optional[BeautifulSoup]:
+        Args:
+            html: Raw HTML from fetch() or the async fetch engine
+            full_page: Parse the whole document instead (debug scripts)
+        """
+        return BeautifulSoup(html, 'lxml', parse_only=None if full_page else self.parse_only)
+
+    def fetch(self, url: str, retry: int = 3, delay: float = 2.0, cache_ttl: Optional[float] = None) -> Optional[str]:
         """
-        Fetch URL with curl_cffi and return BeautifulSoup
+        Fetch URL with a pooled curl_cffi session and return the raw HTML
 
         Args:
             url: URL to fetch
             retry: Number of retry attempts
             delay: Base delay for exponential backoff
+            cache_ttl: Override the response cache TTL (seconds) for this URL
 
         Returns:
-            BeautifulSoup object or None if failed
+            Response text or None if failed
+
+        Raises:
+            CircuitOpenError: HLTV is considered down and no request was made
+            RequestBudgetExhausted: The scraper's request budget is spent
         """
-        headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        if self.cache and self.cache.enabled:
+            cached = self.cache.get(url, ttl=cache_ttl)
+            if cached is not None:
+                return cached
+            if self.cache.replay_only:
+                print(f"❌ Not in cache (replay mode): {url}", file=sys.stderr)
+                return None
 
+        circuit_breaker = self.circuit_breakers.for_url(url)
+        throttled = False
         for attempt in range(retry):
+            # Fail fast (without retries or sleeps) while HLTV is down
+            circuit_breaker.before_request()
+            if self.request_budget is not None:
+                self.request_budget.spend()
+
             try:
                 print(f"Fetching: {url} (attempt {attempt + 1}/{retry})", file=sys.stderr)
 
-                if attempt > 0:
+                # After a 429/503 the rate limiter already holds the host for Retry-After
+                if attempt > 0 and not throttled:
                     wait_time = delay * (2 ** attempt)
                     print(f"⏳ Waiting {wait_time}s...", file=sys.stderr)
                     time.sleep(wait_time)
 
-                response = requests.get(
-                    url,
-                    headers=headers,
-                    impersonate="chrome110",
-                    timeout=30,
-                    allow_redirects=True
-                )
+                self.rate_limiter.acquire(url)
+                with self.session_pool.session() as session:
+                    response = session.get(
+                        url,
+                        timeout=30,
+                        allow_redirects=True
+                    )
+
+                circuit_breaker.record_response(response.status_code)
+                pause = self.rate_limiter.on_response(url, response.status_code, response.headers.get('Retry-After'))
+                throttled = pause is not None
 
                 if response.status_code == 200:
                     print(f"✅ Success: {url}", file=sys.stderr)
-                    return BeautifulSoup(response.text, 'html.parser')
+                    if self.cache:
+                        self.cache.set(url, response.text, ttl=cache_ttl)
+                    return response.text
 
                 print(f"❌ HTTP {response.status_code}: {url}", file=sys.stderr)
 
+                if throttled and pause > MAX_THROTTLE_WAIT:
+                    print(f"⏭️  Throttled for {pause:.0f}s, giving up on {url} for now", file=sys.stderr)
+                    return None
+
             except Exception as e:
+                throttled = False
+                circuit_breaker.record_failure()
                 print(f"❌ Error: {e}", file=sys.stderr)
                 if attempt == retry - 1:
                     raise
@@ -0,0 +1,35 @@
+"""
+Request budget for long scraping runs
+
+A budget caps how many HTTP requests a run (e.g. a historical backfill) may
+make. Scrapers that carry a budget spend one unit per network attempt;
+responses served from the cache are free.
+"""
+from typing import Optional
+import threading
+
+
+class RequestBudgetExhausted(Exception):
+    """Raised instead of making a request once the budget is spent"""
+
+
+class RequestBudget:
+    """Thread-safe counter of the requests a run may still make"""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Requests left, or None for an unlimited budget"""
+        with self._lock:
+            return None if self.limit is None else max(0, self.limit - self.spent)
+
+    def spend(self):
+        """Account for one request, raising RequestBudgetExhausted if none are left"""
+        with self._lock:
+            if self.limit is not None and self.spent >= self.limit:
+                raise RequestBudgetExhausted(f"Request budget of {self.limit} exhausted")
+            self.spent += 1
@@ -0,0 +1,183 @@
+"""
+On-disk HTTP response cache for HLTV scrapers
+
+Entries are stored one file per URL with a per-URL-pattern TTL and evicted
+least-recently-used first once the cache grows past its size limit.
+
+Modes (SCRAPER_CACHE setting, see app.config):
+- off:    no caching (default)
+- on:     serve fresh entries from disk, fetch and store everything else
+- replay: serve only from disk, ignoring TTLs, and never hit HLTV
+"""
+from typing import List, Optional, Tuple
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from app.config import get_scraper_settings
+
+
+# (URL regex, TTL in seconds) - first match wins
+DEFAULT_TTL_RULES: List[Tuple[str, float]] = [
+    (r'/events/?(\?.*)?$', 60 * 60),           # Events list
+    (r'/results\?', 30),                       # Results of live events
+    (r'/stats/', 10 * 60),                     # Player/team stats
+    (r'/events/\d+/', 10 * 60),                # Event pages (details, highlights)
+]
+
+CACHE_MODES = ('off', 'on', 'replay')
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of response bodies on local disk"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 200 * 1024 * 1024,
+        mode: str = 'on',
+        rules: Optional[List[Tuple[str, float]]] = None,
+        default_ttl: float = 0
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode '{mode}'. Must be one of: {', '.join(CACHE_MODES)}")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in (rules or DEFAULT_TTL_RULES)]
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @property
+    def replay_only(self) -> bool:
+        return self.mode == 'replay'
+
+    def ttl_for(self, url: str) -> float:
+        """TTL in seconds for url according to the pattern rules"""
+        for pattern, ttl in self.rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str, ttl: Optional[float] = None) -> Optional[str]:
+        """
+        Return the cached body for url, or None if missing or expired
+
+        Args:
+            url: Request URL
+            ttl: Override the pattern TTL (seconds) for this lookup
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not self.replay_only:
+            max_age = self.ttl_for(url) if ttl is None else ttl
+            if time.time() - entry['fetched_at'] > max_age:
+                return None
+
+        # Touch for LRU ordering
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        print(f"💾 Cache hit: {url}", file=sys.stderr)
+        return entry['body']
+
+    def set(self, url: str, body: str, ttl: Optional[float] = None):
+        """Store body for url if its TTL allows caching"""
+        if not self.enabled or self.replay_only:
+            return
+        if (self.ttl_for(url) if ttl is None else ttl) <= 0:
+            return
+
+        path = self._path(url)
+        data = json.dumps({'url': url, 'fetched_at': time.time(), 'body': body}).encode('utf-8')
+
+        with self._lock:
+            # Sized before the write, so a first scan doesn't count the new file twice
+            size = self._current_size()
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._size = size + len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _current_size(self) -> int:
+        """Total cache size in bytes (caller holds the lock)"""
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        return self._size
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes (caller holds the lock)"""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._size = total
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache configured from settings"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            settings = get_scraper_settings()
+            _cache = ResponseCache(
+                directory=settings.scraper_cache_dir,
+                max_bytes=int(settings.scraper_cache_max_mb * 1024 * 1024),
+                mode=settings.scraper_cache.lower(),
+            )
+        return _cache
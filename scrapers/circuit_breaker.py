@@ -0,0 +1,175 @@
+"""
+Circuit breakers around HLTV requests
+
+After too many consecutive failures the circuit opens and requests fail fast
+with CircuitOpenError. Once reset_timeout has passed, a single probe request
+is let through (half-open): success closes the circuit, failure re-opens it.
+
+Like the rate limiter, there is one circuit per host, so failures of the logo
+CDN (img-cdn.hltv.org) don't stop page scraping on www.hltv.org or vice versa.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import threading
+import time
+import sys
+
+from app.config import get_scraper_settings
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the circuit is open"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        # Seconds until the circuit lets a probe request through
+        self.retry_after = retry_after
+
+
+def is_failure_status(status_code: int) -> bool:
+    """Responses that indicate HLTV/Cloudflare is unavailable or blocking us"""
+    return status_code >= 500 or status_code in (403, 429)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one host"""
+
+    def __init__(self, name: str = 'hltv', failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._opened_at_wall: Optional[datetime] = None
+        self._probe_in_flight = False
+        self._probe_started: float = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """
+        Raise CircuitOpenError unless a request may be made now
+
+        Returns:
+            Whether this request is the half-open probe; a probe that ends
+            without an outcome (e.g. cancelled) must call release_probe()
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                print(f"🔌 Circuit '{self.name}' half-open, probing", file=sys.stderr)
+
+            if self.state == CLOSED:
+                return False
+            # A probe that never reported back (e.g. its thread died) doesn't block new probes forever
+            probe_stale = time.monotonic() - self._probe_started >= self.reset_timeout
+            if self.state == HALF_OPEN and (not self._probe_in_flight or probe_stale):
+                self._probe_in_flight = True
+                self._probe_started = time.monotonic()
+                return True
+
+            retry_after = self.reset_timeout
+            if self.state == OPEN:
+                retry_after = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(f"Circuit '{self.name}' is {self.state}; skipping request", retry_after=retry_after)
+
+    def release_probe(self):
+        """Let another request probe after this one ended without a response or error"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"🔌 Circuit '{self.name}' closed", file=sys.stderr)
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(
+                        f"🔌 Circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures",
+                        file=sys.stderr
+                    )
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._opened_at_wall = datetime.utcnow()
+                self._probe_in_flight = False
+
+    def record_response(self, status_code: int):
+        """Record the outcome of a completed request"""
+        if is_failure_status(status_code):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def snapshot(self) -> Dict:
+        """Current state for status endpoints"""
+        with self._lock:
+            retry_at = None
+            if self.state == OPEN and self._opened_at_wall:
+                retry_at = (self._opened_at_wall + timedelta(seconds=self.reset_timeout)).isoformat()
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "opened_at": self._opened_at_wall.isoformat() if self.state != CLOSED and self._opened_at_wall else None,
+                "probe_after": retry_at
+            }
+
+
+class HostCircuitBreakers:
+    """One circuit breaker per host, created on first use"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """Breaker of url's host"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """State of every host's breaker, for status endpoints"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.snapshot() for host, breaker in breakers.items()}
+
+
+_breakers: Optional[HostCircuitBreakers] = None
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> HostCircuitBreakers:
+    """Return the process-wide per-host circuit breakers configured from settings"""
+    global _breakers
+    with _breakers_lock:
+        if _breakers is None:
+            settings = get_scraper_settings()
+            _breakers = HostCircuitBreakers(
+                failure_threshold=settings.scraper_breaker_threshold,
+                reset_timeout=settings.scraper_breaker_reset,
+            )
+        return _breakers
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Return the circuit breaker of url's host"""
+    return get_circuit_breakers().for_url(url)
@@ -0,0 +1,145 @@
+"""
+Date-range parsing for HLTV event listings
+
+Handles the formats HLTV uses for event dates, e.g.:
+- "Dec 13 - Dec 16" / "Dec 13th - Dec 16th"  (events page, no year)
+- "Dec 28th - Jan 5th"                        (rolls over into the next year)
+- "13th - 16th of December 2024"              (event page)
+- "Nov 28th - Dec 15th 2024"
+- "Dec 13th 2024"                             (single-day event)
+
+Dates are naive UTC, like every other datetime stored by this service.
+"""
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import re
+
+
+MONTHS = {
+    name: number for number, name in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+    )
+}
+
+# Listings of current events may still show an event for a few days after it ended
+CURRENT_EVENT_GRACE = timedelta(days=7)
+
+_RANGE_SEPARATOR = re.compile(r'\s*(?:-|–|—|\bto\b)\s*')
+_ORDINAL = re.compile(r'(\d+)(?:st|nd|rd|th)\b', re.I)
+_TOKEN = re.compile(r'[a-z]+|\d+', re.I)
+
+
+def _parse_side(text: str) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """(day, month, year) found in one side of a range; missing parts are None"""
+    day = month = year = None
+    for token in _TOKEN.findall(text):
+        if token.isdigit():
+            if len(token) == 4:
+                year = int(token)
+            elif day is None:
+                day = int(token)
+        elif token[:3].lower() in MONTHS and month is None:
+            month = MONTHS[token[:3].lower()]
+    return day, month, year
+
+
+def _closest_year(month: int, day: int, reference: datetime) -> Optional[int]:
+    """Year that puts month/day closest to the reference date (None if the day never occurs)"""
+    candidates = []
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            candidates.append((abs((datetime(year, month, day) - reference).days), year))
+        except ValueError:
+            # Feb 29th outside a leap year
+            continue
+    return min(candidates)[1] if candidates else None
+
+
+def _earliest_current_year(start_month: int, start_day: int, end_month: int, end_day: int, rolls_over: bool, reference: datetime) -> Optional[int]:
+    """Earliest start year whose end date is not in the past (None if none is valid)"""
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            if end_of_day(datetime(year + rolls_over, end_month, end_day)) >= reference - CURRENT_EVENT_GRACE:
+                datetime(year, start_month, start_day)
+                return year
+        except ValueError:
+            # Feb 29th outside a leap year
+            continue
+    return None
+
+
+def end_of_day(value: datetime) -> datetime:
+    """Last second of value's day (an event ending "Dec 16" runs until the end of Dec 16)"""
+    return value.replace(hour=23, minute=59, second=59, microsecond=0)
+
+
+def parse_date_range(
+    text: Optional[str],
+    reference: Optional[datetime] = None,
+    current: bool = False
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Parse an HLTV event date range
+
+    Args:
+        text: Date text, e.g. "Dec 13th - Dec 16th" or "13th - 16th of December 2024"
+        reference: Date used to pick the year when the text has none (default: now)
+        current: The event is upcoming or ongoing, so a missing year is the
+            earliest one that doesn't put its end in the past (rather than
+            the year closest to the reference)
+
+    Returns:
+        (start_date, end_date) with end_date at the end of its day, or
+        (None, None) if the text can't be parsed
+    """
+    if not text:
+        return None, None
+
+    text = _ORDINAL.sub(r'\1', text.replace('\xa0', ' ')).strip()
+    sides = [side for side in _RANGE_SEPARATOR.split(text, maxsplit=1) if side]
+    if not sides:
+        return None, None
+
+    start_day, start_month, start_year = _parse_side(sides[0])
+    end_day, end_month, end_year = _parse_side(sides[-1])
+
+    # "13 - 16 of December 2024": the start borrows what only the end states
+    start_month = start_month or end_month
+    end_month = end_month or start_month
+    if start_day is None or end_day is None or start_month is None:
+        return None, None
+
+    # "Dec 28 - Jan 5" ends in the year after it starts
+    rolls_over = (start_month, start_day) > (end_month, end_day)
+    if start_year is None and end_year is not None:
+        start_year = end_year - rolls_over
+    if start_year is None:
+        reference = reference or datetime.utcnow()
+        if current:
+            start_year = _earliest_current_year(start_month, start_day, end_month, end_day, rolls_over, reference)
+        else:
+            start_year = _closest_year(start_month, start_day, reference)
+        if start_year is None:
+            return None, None
+    if end_year is None:
+        end_year = start_year + rolls_over
+
+    try:
+        start_date = datetime(start_year, start_month, start_day)
+        end_date = end_of_day(datetime(end_year, end_month, end_day))
+    except ValueError:
+        return None, None
+
+    if end_date < start_date:
+        return None, None
+    return start_date, end_date
+
+
+def parse_unix_millis(value: Optional[str]) -> Optional[datetime]:
+    """Naive UTC datetime from an HLTV data-unix attribute (milliseconds)"""
+    if not value:
+        return None
+    try:
+        return datetime(1970, 1, 1) + timedelta(milliseconds=int(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
@@ -3,6 +3,8 @@ Scraper for individual HLTV Event page
 URL: https://www.hltv.org/events/{event_id}/{event_slug}
 """
 from .base import BaseScraper
+from .dates import parse_date_range
+from bs4 import SoupStrainer
 from typing import Dict, Optional
 import sys
 import re
@@ -11,6 +13,8 @@ import re
 class EventDetailsScraper(BaseScraper):
     """Scrape detailed information from individual event page"""
 
+    parse_only = SoupStrainer(['h1', 'table'])
+
     def scrape(self, event_id: str) -> Optional[Dict]:
         """
         Scrape event details from individual event page
@@ -24,12 +28,14 @@ class EventDetailsScraper(BaseScraper):
         # Try to construct URL - we need the slug
         # For now, we'll scrape from /events/{event_id}/matches which works without slug
         url = f"{self.base_url}/events/{event_id}/matches"
-        soup = self.fetch(url)
+        html = self.fetch(url)
 
-        if not soup:
+        if not html:
             print(f"❌ Failed to fetch event details for {event_id}", file=sys.stderr)
             return None
 
+        soup = self.make_soup(html)
+
         try:
             details = {}
 
@@ -65,8 +71,9 @@ class EventDetailsScraper(BaseScraper):
                 date_value = date_elem.find_next_sibling('td')
                 if date_value:
                     date_text = date_value.text.strip()
-                    # TODO: Parse dates (format: "13th - 16th of December 2024")
                     details['date_text'] = date_text
+                    # e.g. "13th - 16th of December 2024"
+                    details['start_date'], details['end_date'] = parse_date_range(date_text)
 
             # Teams count
             teams_elem = soup.find('td', string=re.compile(r'Teams', re.I))
@@ -3,6 +3,7 @@ Scraper for HLTV Event Highlights
 URL: https://www.hltv.org/events/{event_id}/{event_slug}
 """
 from .base import BaseScraper
+from bs4 import SoupStrainer
 from typing import List, Dict, Optional
 import sys
 import re
@@ -11,39 +12,52 @@ import re
 class EventHighlightsScraper(BaseScraper):
     """Scrape highlights/clips from event page"""
 
-    def scrape(self, event_id: str, event_slug: str = None) -> List[Dict]:
+    parse_only = SoupStrainer('div', class_='event-highlights')
+
+    def event_url(self, event_id: str, event_slug: str = None) -> str:
+        """URL of the event page that holds the highlights section"""
+        # Build URL - use slug if provided, otherwise try to scrape event list first
+        if event_slug:
+            return f"{self.base_url}/events/{event_id}/{event_slug}"
+
+        # Fallback - might need to be updated per event
+        return f"{self.base_url}/events/{event_id}/starladder-budapest-major-2025"
+
+    def scrape(self, event_id: str, event_slug: str = None, only_if_changed: bool = False) -> Optional[List[Dict]]:
         """
         Scrape highlights from event page
 
         Args:
             event_id: HLTV event ID (e.g., "8042")
             event_slug: Event slug for URL (e.g., "starladder-budapest-major-2025")
+            only_if_changed: Return None if the highlights section is unchanged since the last run
 
         Returns:
-            List of highlights with title, url, thumbnail, etc.
+            List of highlights with title, url, thumbnail, etc., or None if unchanged
         """
-        # Build URL - use slug if provided, otherwise try to scrape event list first
-        if event_slug:
-            url = f"{self.base_url}/events/{event_id}/{event_slug}"
-        else:
-            # Fallback - might need to be updated per event
-            url = f"{self.base_url}/events/{event_id}/starladder-budapest-major-2025"
-
-        soup = self.fetch(url)
+        url = self.event_url(event_id, event_slug)
+        html = self.fetch(url)
 
-        if not soup:
+        if not html:
             print(f"❌ Failed to fetch event page for {event_id}", file=sys.stderr)
             return []
 
-        highlights = []
+        return self.parse(html, event_id, url=url if only_if_changed else None)
 
+    def find_region(self, soup) -> list:
         # Find highlights section
         highlights_section = soup.find('div', class_='event-highlights')
+        return [highlights_section] if highlights_section else []
 
-        if not highlights_section:
+    def parse_region(self, region: list, event_id: str) -> List[Dict]:
+        """Parse highlight items from the highlights section"""
+        if not region:
             print(f"⚠️  No highlights section found for event {event_id}", file=sys.stderr)
             return []
 
+        highlights_section = region[0]
+        highlights = []
+
         print(f"✅ Found highlights section for event {event_id}", file=sys.stderr)
 
         # Find all highlight video divs
@@ -0,0 +1,123 @@
+"""
+Scraper for the HLTV events archive
+URL: https://www.hltv.org/events/archive?offset={offset}
+"""
+from .base import BaseScraper
+from .dates import end_of_day, parse_date_range, parse_unix_millis
+from bs4 import SoupStrainer
+from datetime import date
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlencode
+import sys
+import re
+
+
+# Events listed per archive page
+ARCHIVE_PAGE_SIZE = 50
+
+
+class EventsArchiveScraper(BaseScraper):
+    """Scrape past events, newest first, from /events/archive"""
+
+    parse_only = SoupStrainer('a', class_='small-event')
+
+    def archive_url(self, offset: int = 0, start_date: Optional[date] = None, end_date: Optional[date] = None) -> str:
+        """URL of one archive page, optionally limited to events within a date range"""
+        params = {}
+        if start_date:
+            params['startDate'] = start_date.isoformat()
+        if end_date:
+            params['endDate'] = end_date.isoformat()
+        if offset:
+            params['offset'] = offset
+        query = f"?{urlencode(params)}" if params else ""
+        return f"{self.base_url}/events/archive{query}"
+
+    def scrape_page(
+        self,
+        offset: int = 0,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Optional[Tuple[List[Dict], int]]:
+        """
+        Scrape one archive page
+
+        Returns:
+            (event dictionaries, number of event rows listed on the page), or
+            None if the fetch failed. A page lists fewer than ARCHIVE_PAGE_SIZE
+            rows only at the end of the archive; rows that fail to parse are
+            counted but not returned.
+        """
+        url = self.archive_url(offset, start_date, end_date)
+        html = self.fetch(url)
+
+        if not html:
+            print(f"❌ Failed to fetch events archive at offset {offset}", file=sys.stderr)
+            return None
+
+        return self.parse(html)
+
+    def find_region(self, soup) -> list:
+        return soup.find_all('a', class_='small-event')
+
+    def parse_region(self, containers: list) -> Tuple[List[Dict], int]:
+        """Parse all event rows of an archive page; returns (events, rows listed)"""
+        events = []
+        print(f"📊 Found {len(containers)} archived events", file=sys.stderr)
+
+        for container in containers:
+            try:
+                event = self._parse_event_row(container)
+                if event:
+                    events.append(event)
+            except Exception as e:
+                print(f"⚠️  Error parsing archived event: {e}", file=sys.stderr)
+                continue
+
+        return events, len(containers)
+
+    def _parse_event_row(self, container) -> Optional[Dict]:
+        """Parse a single archived event row"""
+
+        # Extract event ID and slug from URL: /events/7148/starladder-budapest-major-2025
+        match = re.search(r'/events/(\d+)/([^/?#]+)', container.get('href', ''))
+        if not match:
+            return None
+
+        external_id = match.group(1)
+        slug = match.group(2)
+
+        # Event name
+        name_elem = container.find('div', class_='text-ellipsis')
+        name = name_elem.text.strip() if name_elem else slug
+
+        # Date range - unix timestamps when present, else the text ("Dec 13th - Dec 16th 2024")
+        start_date = None
+        end_date = None
+        date_elem = container.find(class_='col-date') or container
+        unix_dates = [parse_unix_millis(span.get('data-unix')) for span in date_elem.find_all(attrs={'data-unix': True})]
+        unix_dates = [value for value in unix_dates if value]
+        if unix_dates:
+            start_date = unix_dates[0].replace(hour=0, minute=0, second=0, microsecond=0)
+            end_date = end_of_day(unix_dates[-1])
+        elif date_elem is not container:
+            start_date, end_date = parse_date_range(date_elem.text.strip())
+
+        # Prize pool
+        prize_elem = container.find(class_='prizePoolEllipsis')
+        prize_pool = prize_elem.text.strip() if prize_elem else None
+
+        # Location
+        location_elem = container.find('span', class_='smallCountry')
+        location = location_elem.text.strip() if location_elem else None
+
+        return {
+            'external_id': external_id,
+            'slug': slug,
+            'name': name,
+            'start_date': start_date,
+            'end_date': end_date,
+            'prize_pool': prize_pool,
+            'location': location,
+            'status': 'finished'
+        }
@@ -0,0 +1,48 @@
+"""
+Content fingerprints for scraped pages
+
+Remembers a hash of the relevant DOM region of each URL so scrapers can tell
+callers when a page has not changed since the previous run.
+"""
+from typing import Dict, Iterable, Optional
+import hashlib
+import threading
+
+
+def region_digest(elements: Iterable) -> str:
+    """Hash the serialized HTML of the given BeautifulSoup elements"""
+    digest = hashlib.sha1()
+    for element in elements:
+        digest.update(str(element).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    """Thread-safe in-memory map of URL -> last seen region digest"""
+
+    def __init__(self):
+        self._digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Digest recorded for key on the previous run, if any"""
+        with self._lock:
+            return self._digests.get(key)
+
+    def remember(self, key: str, digest: str):
+        """Record the digest seen for key on this run"""
+        with self._lock:
+            self._digests[key] = digest
+
+    def forget(self, key: str):
+        """Drop the digest for key so the next run is treated as changed"""
+        with self._lock:
+            self._digests.pop(key, None)
+
+
+_store = FingerprintStore()
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    """Return the process-wide fingerprint store"""
+    return _store
@@ -0,0 +1,63 @@
+"""
+Process pool for HTML parsing
+
+BeautifulSoup parsing is CPU-bound and holds the GIL, so running it in the
+API process makes request latency spike during syncs. Scrapers hand raw HTML
+to a worker process and get plain row dicts back.
+
+SCRAPER_PARSE_WORKERS sets the pool size; 0 parses inline in the caller.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+import multiprocessing
+import threading
+
+from app.config import get_scraper_settings
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the process-wide parse pool, or None when parsing inline"""
+    global _pool
+    workers = get_scraper_settings().scraper_parse_workers
+    if workers <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs uvicorn and scheduler threads is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _parse_page(scraper_cls, html: str, args: tuple, previous_digest: Optional[str]) -> Tuple[str, Optional[list]]:
+    """Worker entry point: parse html with a fresh scraper instance"""
+    return scraper_cls().parse_page(html, *args, previous_digest=previous_digest)
+
+
+def run_parse(scraper_cls, html: str, args: tuple, previous_digest: Optional[str] = None) -> Tuple[str, Optional[list]]:
+    """
+    Parse a page in the pool (or inline if the pool is disabled)
+
+    Returns:
+        (region digest, rows) - rows is None if the digest equals previous_digest
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        return _parse_page(scraper_cls, html, args, previous_digest)
+    return pool.submit(_parse_page, scraper_cls, html, args, previous_digest).result()
+
+
+def shutdown_parse_pool():
+    """Stop the worker processes (used on shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
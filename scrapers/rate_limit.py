@@ -0,0 +1,166 @@
+"""
+Host-aware rate limiter shared by every HLTV request
+
+Each host gets a token bucket. A 429/503 halves the host's rate and pauses it
+for the Retry-After period; successful responses slowly restore the rate.
+
+The image CDN serving team logos gets its own, much faster bucket: logo
+proxy requests are static files and must not queue behind page scraping.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import threading
+import time
+import sys
+
+from app.config import get_scraper_settings
+
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Host of HLTV's static images (team logos)
+IMAGE_CDN_HOST = 'img-cdn.hltv.org'
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket for a single host; tokens go negative for queued reservations"""
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        # While paused, updated sits at the end of the pause so no tokens accrue
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = max(self.updated, now)
+        self.tokens -= 1
+
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return wait + max(0.0, self.paused_until - now)
+
+    def pause(self, now: float, seconds: float):
+        """Stop handing out tokens for the given number of seconds"""
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, self.paused_until)
+
+
+class HostRateLimiter:
+    """Per-host token buckets with adaptive slow-down on throttling responses"""
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 3,
+        min_rate: float = 0.05,
+        default_pause: float = 30.0,
+        host_limits: Optional[Dict[str, Tuple[float, int]]] = None
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.default_pause = default_pause
+        # host -> (rate, burst) for hosts that don't use the default limits
+        self.host_limits = dict(host_limits or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Bucket for host (caller holds the lock)"""
+        if host not in self._buckets:
+            rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+            self._buckets[host] = TokenBucket(rate, burst)
+        return self._buckets[host]
+
+    def _reserve(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(urlparse(url).netloc).reserve(time.monotonic())
+
+    def acquire(self, url: str):
+        """Block until a request to url's host is allowed"""
+        wait = self._reserve(url)
+        if wait > 0:
+            print(f"🚦 Rate limit: waiting {wait:.1f}s for {urlparse(url).netloc}", file=sys.stderr)
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Wait (without blocking the event loop) until a request to url's host is allowed"""
+        wait = self._reserve(url)
+        if wait > 0:
+            print(f"🚦 Rate limit: waiting {wait:.1f}s for {urlparse(url).netloc}", file=sys.stderr)
+            await asyncio.sleep(wait)
+
+    def on_response(self, url: str, status_code: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Adapt the host's rate to a response
+
+        Returns:
+            Seconds the host is paused for if the response was 429/503, else None
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+
+            if status_code in THROTTLE_STATUS_CODES:
+                pause = parse_retry_after(retry_after)
+                if pause is None:
+                    pause = self.default_pause
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                bucket.pause(time.monotonic(), pause)
+                print(
+                    f"🚦 HTTP {status_code} from {host}: pausing {pause:.0f}s, rate now {bucket.rate:.2f} req/s",
+                    file=sys.stderr
+                )
+                return pause
+
+            if status_code < 400 and bucket.rate < bucket.base_rate:
+                # Additive recovery towards the configured rate
+                bucket.rate = min(bucket.base_rate, bucket.rate + bucket.base_rate * 0.1)
+
+        return None
+
+
+_limiter: Optional[HostRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide rate limiter configured from settings"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            settings = get_scraper_settings()
+            _limiter = HostRateLimiter(
+                rate=settings.scraper_rate_per_host,
+                burst=settings.scraper_burst_per_host,
+                host_limits={
+                    IMAGE_CDN_HOST: (settings.scraper_image_cdn_rate, settings.scraper_image_cdn_burst),
+                },
+            )
+        return _limiter
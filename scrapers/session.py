@@ -0,0 +1,127 @@
+"""
+Shared curl_cffi session pool for HLTV scrapers
+
+Keeps a small set of impersonated browser sessions alive so consecutive
+requests reuse TLS connections instead of paying a new handshake per page.
+"""
+from curl_cffi import requests
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+import threading
+import time
+
+from app.config import get_scraper_settings
+
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+IMPERSONATE = "chrome110"
+
+
+class SessionPool:
+    """
+    Thread-safe pool of keep-alive curl_cffi sessions
+
+    A session is handed to one thread at a time (curl handles are not
+    thread-safe). Sessions idle for longer than idle_timeout are closed the
+    next time the pool is used.
+    """
+
+    def __init__(self, size: int = 4, idle_timeout: float = 300.0, impersonate: str = IMPERSONATE):
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.impersonate = impersonate
+        self._idle: List[Tuple[requests.Session, float]] = []
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def _new_session(self) -> requests.Session:
+        return requests.Session(impersonate=self.impersonate, headers=DEFAULT_HEADERS)
+
+    def _evict_idle(self):
+        """Close sessions that have been idle too long (caller holds the lock)"""
+        cutoff = time.monotonic() - self.idle_timeout
+        keep = []
+        for session, last_used in self._idle:
+            if last_used < cutoff:
+                session.close()
+                self._created -= 1
+            else:
+                keep.append((session, last_used))
+        self._idle = keep
+
+    def acquire(self) -> requests.Session:
+        """Take a session from the pool, blocking while all are in use"""
+        with self._cond:
+            self._evict_idle()
+            while True:
+                if self._idle:
+                    # LIFO: the most recently used session has the warmest connections
+                    return self._idle.pop()[0]
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._cond.wait()
+
+        try:
+            return self._new_session()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, session: requests.Session):
+        """Return a session to the pool"""
+        with self._cond:
+            self._idle.append((session, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def session(self) -> Iterator[requests.Session]:
+        """Borrow a session for the duration of a with-block"""
+        session = self.acquire()
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def close(self):
+        """Close all idle sessions"""
+        with self._cond:
+            for session, _ in self._idle:
+                session.close()
+            self._created -= len(self._idle)
+            self._idle = []
+
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """Return the process-wide session pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            settings = get_scraper_settings()
+            _pool = SessionPool(
+                size=settings.scraper_pool_size,
+                idle_timeout=settings.scraper_pool_idle_timeout,
+            )
+        return _pool
+
+
+def close_session_pool():
+    """Close the process-wide session pool (used on shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -3,6 +3,8 @@ Scraper for HLTV Events page
 URL: https://www.hltv.org/events
 """
 from .base import BaseScraper
+from .dates import end_of_day, parse_date_range, parse_unix_millis
+from bs4 import SoupStrainer
 from typing import List, Dict, Optional
 from datetime import datetime
 import sys
@@ -12,15 +14,19 @@ import re
 class StatsEventsScraper(BaseScraper):
     """Scrape upcoming and ongoing events from /events page"""
 
+    parse_only = SoupStrainer('div', class_='event-col')
+
     def scrape(self) -> List[Dict]:
         """Scrape events from HLTV events page"""
         url = f"{self.base_url}/events"
-        soup = self.fetch(url)
+        html = self.fetch(url)
 
-        if not soup:
+        if not html:
             print(f"❌ Failed to fetch events", file=sys.stderr)
             return []
 
+        soup = self.make_soup(html)
+
         events = []
 
         # Find all event containers
@@ -66,9 +72,15 @@ class StatsEventsScraper(BaseScraper):
         start_date = None
         end_date = None
         if date_elem:
-            date_text = date_elem.text.strip()
-            # TODO: Parse date range (format: "Dec 13 - Dec 16")
-            # For now, leave as None - can be enhanced later
+            # Prefer the unix timestamps behind the localized text when they are present
+            unix_dates = [parse_unix_millis(span.get('data-unix')) for span in date_elem.find_all(attrs={'data-unix': True})]
+            unix_dates = [date for date in unix_dates if date]
+            if unix_dates:
+                start_date = unix_dates[0].replace(hour=0, minute=0, second=0, microsecond=0)
+                end_date = end_of_day(unix_dates[-1])
+            else:
+                # e.g. "Dec 13th - Dec 16th"; listed events are upcoming or ongoing
+                start_date, end_date = parse_date_range(date_elem.text.strip(), current=True)
 
         # Prize pool
         prize_elem = container.find('div', class_='prizePoolEllipsis')
@@ -3,11 +3,15 @@ Scraper for HLTV Results page
 URL: https://www.hltv.org/results?event={event_id}
 """
 from .base import BaseScraper
-from typing import List, Dict, Optional
+from bs4 import SoupStrainer
+from typing import List, Dict, Optional, Set
 from datetime import datetime
 import sys
 import re
 
+RESULTS_PAGE_SIZE = 100
+MAX_RESULTS_PAGES = 50
+
 
 def upgrade_logo_quality(logo_url: str) -> str:
     """
@@ -34,19 +38,94 @@ def upgrade_logo_quality(logo_url: str) -> str:
     return upgraded
 
 
+def unique_matches(matches: List[Dict]) -> List[Dict]:
+    """Drop repeated matches (featured results, overlapping pages), keeping the first"""
+    seen = set()
+    unique = []
+    for match in matches:
+        if match['external_id'] not in seen:
+            seen.add(match['external_id'])
+            unique.append(match)
+    return unique
+
+
 class StatsMatchesScraper(BaseScraper):
     """Scrape matches from /results page"""
 
-    def scrape(self, event_id: str) -> List[Dict]:
-        url = f"{self.base_url}/results?event={event_id}"
-        soup = self.fetch(url)
-
-        if not soup:
+    parse_only = SoupStrainer('div', class_='result-con')
+
+    def results_url(self, event_id: str, offset: int = 0) -> str:
+        """URL of a /results page for an event (newest first, RESULTS_PAGE_SIZE per page)"""
+        if offset:
+            return f"{self.base_url}/results?offset={offset}&event={event_id}"
+        return f"{self.base_url}/results?event={event_id}"
+
+    def has_more_pages(self, page_matches: List[Dict], known_finished_ids: Set[str]) -> bool:
+        """
+        Whether to walk on to the next (older) results page
+
+        Stops on a short page (the last one) or as soon as a page contains a
+        match that is already stored as finished - everything older has been
+        ingested.
+        """
+        if len(page_matches) < RESULTS_PAGE_SIZE:
+            return False
+        return not any(match['external_id'] in known_finished_ids for match in page_matches)
+
+    def scrape(
+        self,
+        event_id: str,
+        only_if_changed: bool = False,
+        known_finished_ids: Optional[Set[str]] = None,
+        max_pages: int = MAX_RESULTS_PAGES
+    ) -> Optional[List[Dict]]:
+        """
+        Scrape matches for a specific event
+
+        Args:
+            event_id: HLTV event ID
+            only_if_changed: Return None if the first results page is unchanged since the last run
+            known_finished_ids: Follow pagination until a page contains one of these match IDs
+                (an empty set walks every page). None reads only the first page.
+            max_pages: Safety limit on the number of pages walked
+
+        Returns:
+            List of match dictionaries, or None if unchanged
+        """
+        url = self.results_url(event_id)
+        html = self.fetch(url)
+
+        if not html:
             print(f"❌ Failed to fetch matches for event {event_id}", file=sys.stderr)
             return []
 
+        matches = self.parse(html, event_id, url=url if only_if_changed else None)
+        if matches is None or known_finished_ids is None:
+            return matches
+
+        page_matches = matches
+        page = 1
+        while page < max_pages and self.has_more_pages(page_matches, known_finished_ids):
+            html = self.fetch(self.results_url(event_id, offset=page * RESULTS_PAGE_SIZE))
+            if not html:
+                print(f"❌ Failed to fetch results page {page + 1} for event {event_id}", file=sys.stderr)
+                # Older pages are still missing: the next run must walk them again
+                # rather than see an unchanged first page and skip the event
+                if only_if_changed:
+                    self.fingerprints.forget(url)
+                break
+            page_matches = self.parse(html, event_id)
+            matches.extend(page_matches)
+            page += 1
+
+        return unique_matches(matches)
+
+    def find_region(self, soup) -> list:
+        return soup.find_all('div', class_='result-con')
+
+    def parse_region(self, result_containers: list, event_id: str) -> List[Dict]:
+        """Parse all match containers from a /results page"""
         matches = []
-        result_containers = soup.find_all('div', class_='result-con')
         print(f"📊 Found {len(result_containers)} match containers for event {event_id}", file=sys.stderr)
 
         for container in result_containers:
@@ -3,6 +3,7 @@ Scraper for HLTV Player Stats
 URL: https://www.hltv.org/stats/players?event={event_id}
 """
 from .base import BaseScraper
+from bs4 import SoupStrainer
 from typing import List, Dict, Optional
 import sys
 import re
@@ -11,32 +12,47 @@ import re
 class StatsPlayersScraper(BaseScraper):
     """Scrape player statistics from /stats/players page"""
 
-    def scrape(self, event_id: str) -> List[Dict]:
+    parse_only = SoupStrainer('table', class_='stats-table')
+
+    def stats_url(self, event_id: str) -> str:
+        """URL of the event's /stats/players page"""
+        return f"{self.base_url}/stats/players?event={event_id}"
+
+    def scrape(self, event_id: str, only_if_changed: bool = False, cache_ttl: Optional[float] = None) -> Optional[List[Dict]]:
         """
         Scrape player stats for a specific event
 
         Args:
             event_id: HLTV event ID
+            only_if_changed: Return None if the stats table is unchanged since the last run
+            cache_ttl: Response cache TTL override (e.g. days for finished events)
 
         Returns:
-            List of player stat dictionaries
+            List of player stat dictionaries, or None if unchanged
         """
-        url = f"{self.base_url}/stats/players?event={event_id}"
-        soup = self.fetch(url)
+        url = self.stats_url(event_id)
+        html = self.fetch(url, cache_ttl=cache_ttl)
 
-        if not soup:
+        if not html:
             print(f"❌ Failed to fetch player stats for event {event_id}", file=sys.stderr)
             return []
 
-        players = []
+        return self.parse(html, event_id, url=url if only_if_changed else None)
 
+    def find_region(self, soup) -> list:
         # Find the stats table
         stats_table = soup.find('table', class_='stats-table')
+        return [stats_table] if stats_table else []
 
-        if not stats_table:
+    def parse_region(self, region: list, event_id: str) -> List[Dict]:
+        """Parse player rows from the stats table"""
+        if not region:
             print(f"⚠️  No stats table found for event {event_id}", file=sys.stderr)
             return []
 
+        stats_table = region[0]
+        players = []
+
         # Find all player rows (tbody tr)
         tbody = stats_table.find('tbody')
         if not tbody:
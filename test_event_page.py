@@ -1,29 +1,20 @@
-from curl_cffi import requests
-from bs4 import BeautifulSoup
+"""
+Debug script to list the tables on an HLTV event page
 
-url = "https://www.hltv.org/events/8042/starladder-budapest-major-2025"
+Set SCRAPER_CACHE=on (or replay) to re-run against cached responses.
+"""
+from scrapers.base import BaseScraper
 
-headers = {
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate, br',
-    'DNT': '1',
-    'Upgrade-Insecure-Requests': '1',
-}
+scraper = BaseScraper()
+url = f"{scraper.base_url}/events/8042/starladder-budapest-major-2025"
 
-response = requests.get(
-    url,
-    headers=headers,
-    impersonate="chrome110",
-    timeout=30
-)
+html = scraper.fetch(url)
 
-print(f"Status: {response.status_code}")
-print(f"URL: {response.url}")
+print(f"URL: {url}")
+
+if html:
+    soup = scraper.make_soup(html, full_page=True)
 
-if response.status_code == 200:
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
     # Look for stats tables
     tables = soup.find_all('table')
     print(f"\nFound {len(tables)} tables")
@@ -36,3 +27,5 @@ if response.status_code == 200:
             print(f"  {len(rows)} rows")
             if len(rows) > 0:
                 print(f"  First row: {rows[0].text[:100]}")
+else:
+    print("Failed to fetch page")
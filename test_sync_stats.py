@@ -1,17 +1,14 @@
 """
-Test script to sync player and team stats for Budapest Major
+Test script to sync player and team stats for an event (default: Budapest Major)
 """
 import sys
-from scrapers.stats_players import StatsPlayersScraper
-from scrapers.stats_teams import StatsTeamsScraper
 from app.database import SessionLocal
-from app.models import EventPlayerStat, EventTeamStat, Event
+from app.models import Event
+from jobs.sync_stats import finalize_event_stats, sync_event_player_stats, sync_event_team_stats
 from sqlalchemy import select
 
-def sync_stats():
-    """Sync player and team stats for Budapest Major (event_id=8042)"""
-
-    event_id = "8042"  # Budapest Major
+def sync_stats(event_id: str = "8042", final: bool = False):
+    """Sync player and team stats for one event by HLTV ID"""
 
     db = SessionLocal()
 
@@ -25,82 +22,21 @@ def sync_stats():
             return
 
         print(f"📌 Syncing stats for event: {event.name} (id={event.id})")
-
-        # Scrape players
-        print("\n🔄 Scraping player stats...")
-        player_scraper = StatsPlayersScraper()
-        players_data = player_scraper.scrape(event_id)
-
-        print(f"\n💾 Inserting {len(players_data)} player stats...")
-        for player_data in players_data:
-            # Check if exists
-            existing = db.query(EventPlayerStat).filter(
-                EventPlayerStat.event_id == event.id,
-                EventPlayerStat.player_name == player_data['player_name']
-            ).first()
-
-            if existing:
-                # Update
-                existing.team_name = player_data['team_name']
-                existing.rating = player_data['rating']
-                existing.kd_ratio = player_data['kd_ratio']
-                existing.maps_played = player_data['maps_played']
-            else:
-                # Insert
-                stat = EventPlayerStat(
-                    event_id=event.id,
-                    player_name=player_data['player_name'],
-                    team_name=player_data['team_name'],
-                    rating=player_data['rating'],
-                    kd_ratio=player_data['kd_ratio'],
-                    maps_played=player_data['maps_played']
-                )
-                db.add(stat)
-
-        db.commit()
-        print(f"✅ Player stats saved!")
-
-        # Scrape teams
-        print("\n🔄 Scraping team stats...")
-        team_scraper = StatsTeamsScraper()
-        teams_data = team_scraper.scrape(event_id)
-
-        print(f"\n💾 Inserting {len(teams_data)} team stats...")
-        for team_data in teams_data:
-            # Check if exists
-            existing = db.query(EventTeamStat).filter(
-                EventTeamStat.event_id == event.id,
-                EventTeamStat.team_name == team_data['team_name']
-            ).first()
-
-            if existing:
-                # Update
-                existing.team_logo = team_data['team_logo']
-                existing.wins = team_data['wins']
-                existing.losses = team_data['losses']
-                existing.win_rate = team_data['win_rate']
-                existing.maps_played = team_data['maps_played']
-            else:
-                # Insert
-                stat = EventTeamStat(
-                    event_id=event.id,
-                    team_name=team_data['team_name'],
-                    team_logo=team_data['team_logo'],
-                    wins=team_data['wins'],
-                    losses=team_data['losses'],
-                    win_rate=team_data['win_rate'],
-                    maps_played=team_data['maps_played']
-                )
-                db.add(stat)
-
-        db.commit()
-        print(f"✅ Team stats saved!")
-
-        print("\n🎉 All stats synced successfully!")
+        internal_id = event.id
 
     finally:
         db.close()
 
+    if final:
+        finalize_event_stats(internal_id)
+    else:
+        sync_event_player_stats(internal_id)
+        sync_event_team_stats(internal_id)
+
+    print("\n🎉 All stats synced successfully!")
+
 
 if __name__ == "__main__":
-    sync_stats()
+    # Usage: python test_sync_stats.py [hltv_event_id] [--final]
+    args = [arg for arg in sys.argv[1:] if arg != '--final']
+    sync_stats(args[0] if args else "8042", final='--final' in sys.argv)